@@ -0,0 +1,9 @@
+"""
+Gunicorn settings, picked up automatically when gunicorn is started from
+this directory. Worker flags stay on the command line (see README.md).
+"""
+
+# Agents talk to the coordinator at least every 30 seconds over a kept-alive
+# session; hold idle connections long enough that they get reused instead of
+# paying a new TCP/TLS handshake (gunicorn's default is 2 seconds)
+keepalive = 75
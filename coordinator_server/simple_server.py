@@ -8,24 +8,239 @@ Server tracks agents, distributes tasks, collects results.
 Run this on a machine with a public IP or accessible network location.
 """
 
-from flask import Flask, request, jsonify
+try:
+    # Optional: serve `python simple_server.py` with gevent. Patching must happen
+    # before threading is imported; under gunicorn the gevent worker does it.
+    from gevent import monkey
+    if __name__ == '__main__':
+        monkey.patch_all()
+except ImportError:
+    monkey = None
+
+from flask import Flask, Response, abort, request, jsonify
+from flask.json.provider import DefaultJSONProvider
+from markupsafe import escape
 import time
 from datetime import datetime
 import threading
+import functools
+import heapq
+import itertools
 import json
+import math
+import zlib
+from collections import deque
+
+try:
+    import orjson  # Optional: C-speed JSON encoding and decoding
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack  # Optional: binary request/response bodies for agents
+except ImportError:
+    msgpack = None
+
+MSGPACK_MIMETYPES = ('application/msgpack', 'application/x-msgpack')
+
+# Upper bound on a gzip request body once inflated
+MAX_INFLATED_BODY = 16 * 1024 * 1024
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """jsonify()/request.json backed by orjson's C encoder and decoder."""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 
 app = Flask(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+
+# Dashboard assets are referenced with content-hashed URLs, so they can be
+# cached by browsers for a year without going stale.
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 31536000
 
 # In-memory storage (use Redis/database for production)
-agents = {}  # agent_id -> {info, last_heartbeat}
-tasks = []  # Pending tasks queue
+agents = {}  # agent_id -> {info, last_heartbeat, heartbeat_mono}
+tasks = {}  # task_id -> task, for every task still waiting on a result
+unassigned = deque()  # Tasks not yet handed to an agent, oldest first
 task_assignments = {}  # task_id -> agent_id
 results = {}  # task_id -> result
 resources = {}  # agent_id -> {resource_data, last_updated}
 mining_stats = {}  # agent_id -> {mining_data, last_updated}
 
-# Lock for thread-safe operations
-lock = threading.Lock()
+# Task ids; seeded from the clock so ids stay unique across server restarts.
+# next() on a count is atomic, so no lock or sleep is needed for uniqueness.
+task_ids = itertools.count(int(time.time() * 1000))
+
+# Heartbeat freshness is measured on the monotonic clock so that wall-clock
+# jumps (NTP, manual changes) can't mark every agent offline or keep dead ones
+# online; wall-clock `last_heartbeat` is kept only for display
+_mono = time.monotonic
+
+# Agents with a heartbeat in the last ONLINE_TIMEOUT seconds, maintained
+# incrementally: each heartbeat pushes (expires_at, agent_id, heartbeat_mono)
+# and entries superseded by a newer heartbeat are skipped when popped
+ONLINE_TIMEOUT = 60
+online_set = set()
+online_expiry = []
+
+# Resource summary, maintained incrementally: each report replaces the agent's
+# summary row and its share of the running totals, and rows drop out once the
+# report is older than RESOURCE_TIMEOUT (same lazy heap scheme as above)
+RESOURCE_TIMEOUT = 300
+resource_rows = {}  # agent_id -> summary row of the latest report
+resource_sums = {'cpu_cores': 0, 'memory_gb': 0, 'storage_gb': 0, 'gpu_count': 0}
+resource_expiry = []
+
+# Locks for thread-safe operations, one per group of state so that heartbeats,
+# task polls and dashboard reads don't all queue behind each other. When more
+# than one is needed, take them in this order.
+agents_lock = threading.Lock()  # agents, online_set, online_expiry
+tasks_lock = threading.Lock()  # tasks, unassigned, task_assignments
+results_lock = threading.Lock()  # results
+resources_lock = threading.Lock()  # resources, resource_rows/sums/expiry, mining_stats
+
+# Signalled when a task is queued, waking agents long-polling /api/tasks/next
+task_queued = threading.Condition(tasks_lock)
+MAX_TASK_WAIT = 30  # seconds
+MAX_POLL_TASKS = 16  # Most tasks handed out by one /api/poll
+
+# Bumped on every mutation that is visible on the dashboard; streams wait on it.
+# Its lock is always taken last, after any of the locks above.
+state_version = 0
+state_changed = threading.Condition()
+
+# Distinguishes this process's versions from those of a previous run
+STATE_EPOCH = format(time.time_ns(), 'x')
+
+# Dashboard stream pacing (seconds)
+STREAM_MIN_INTERVAL = 1
+STREAM_REFRESH_INTERVAL = 30
+
+
+def mark_state_changed():
+    """Record a dashboard-visible state change."""
+    global state_version
+    with state_changed:
+        state_version += 1
+        state_changed.notify_all()
+
+
+def record_heartbeat(agent_id, now, now_mono):
+    """
+    Stamp a heartbeat for a known agent at the given wall and monotonic times,
+    read once per request. Caller must hold `agents_lock`.
+    """
+    agent = agents[agent_id]
+    agent['last_heartbeat'] = now
+    agent['heartbeat_mono'] = now_mono
+    online_set.add(agent_id)
+    heapq.heappush(online_expiry, (now_mono + ONLINE_TIMEOUT, agent_id, now_mono))
+
+
+def expire_online(now_mono):
+    """Drop agents whose last heartbeat has timed out. Caller must hold `agents_lock`."""
+    expired = False
+    while online_expiry and online_expiry[0][0] <= now_mono:
+        _, agent_id, heartbeat_mono = heapq.heappop(online_expiry)
+        agent = agents.get(agent_id)
+        if agent is None or agent['heartbeat_mono'] == heartbeat_mono:
+            expired |= agent_id in online_set
+            online_set.discard(agent_id)
+    if expired:
+        mark_state_changed()
+
+
+def state_etag():
+    """
+    ETag for payloads built from the shared state. It is weak because relative
+    fields such as last_seen keep drifting while the version stays the same.
+    Timed-out agents are expired first, so that going offline changes the tag.
+    """
+    with agents_lock:
+        expire_online(_mono())
+    with state_changed:
+        return f"{STATE_EPOCH}-{state_version}"
+
+
+def not_modified(etag):
+    """Return a 304 response if the client already has `etag`, else None."""
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+        response.set_etag(etag, weak=True)
+        return response
+    return None
+
+
+def tag_response(response, etag):
+    """Attach a weak `etag` and make clients revalidate it on every poll."""
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+def inflate_body():
+    """Return the request body, gunzipped if sent with Content-Encoding: gzip."""
+    body = request.get_data(cache=False)
+    if request.content_encoding != 'gzip':
+        return body
+    
+    inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    try:
+        body = inflater.decompress(body, MAX_INFLATED_BODY)
+    except zlib.error:
+        abort(400, description='Malformed gzip body')
+    if inflater.unconsumed_tail:
+        abort(413)
+    return body
+
+
+def parse_body():
+    """
+    Decode the request body as msgpack or JSON, according to its Content-Type.
+    Bodies are read once, so neither the raw bytes nor the decoded value are
+    kept on the request. Malformed bodies are rejected with 400.
+    """
+    if msgpack is not None and request.mimetype in MSGPACK_MIMETYPES:
+        try:
+            return msgpack.unpackb(inflate_body(), raw=False)
+        except ValueError:
+            abort(400, description='Malformed msgpack body')
+    if request.content_encoding == 'gzip' and request.is_json:
+        try:
+            return app.json.loads(inflate_body())
+        except ValueError:
+            abort(400, description='Malformed JSON body')
+    return request.get_json(cache=False)
+
+
+def respond(obj):
+    """Encode `obj` as msgpack if the client prefers it, otherwise as JSON."""
+    if msgpack is None:
+        return jsonify(obj)
+    
+    # Ties and a missing Accept header go to JSON, the first offer
+    best = request.accept_mimetypes.best_match(('application/json',) + MSGPACK_MIMETYPES)
+    if best in MSGPACK_MIMETYPES:
+        response = Response(msgpack.packb(obj), mimetype='application/msgpack')
+    else:
+        response = jsonify(obj)
+    # The body depends on Accept, so shared caches must key on it
+    response.vary.add('Accept')
+    return response
+
+
+def dumps_bytes(obj):
+    """Serialize `obj` to JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
 
 
 @app.route('/')
@@ -34,72 +249,88 @@ def index():
     from flask import redirect
     return redirect('/dashboard')
 
-@app.route('/dashboard')
-def dashboard():
-    """Enhanced dashboard page."""
-    try:
-        from dashboard import dashboard as dashboard_route
-        return dashboard_route()
-    except ImportError:
-        # Fallback to simple dashboard if dashboard module not available
-        online_agents = [
-            agent_id for agent_id, data in agents.items()
-            if time.time() - data['last_heartbeat'] < 60
-        ]
-        
-        return f"""
+# Fallback page used when dashboard.py is unavailable; the scaffold is fixed,
+# so only the stats and agent rows are formatted per request
+FALLBACK_HEADER = """
         <html>
         <head>
             <title>Alpha Coordinator</title>
             <meta http-equiv="refresh" content="5">
             <style>
-                body {{ font-family: Arial, sans-serif; padding: 20px; background: #f5f5f5; }}
-                .container {{ max-width: 800px; margin: 0 auto; background: white; padding: 20px; border-radius: 10px; }}
-                h1 {{ color: #333; }}
-                .stat {{ background: #e8f4fd; padding: 15px; margin: 10px 0; border-radius: 5px; }}
-                .agent {{ background: #f0f8f0; padding: 10px; margin: 5px 0; border-radius: 5px; }}
+                body { font-family: Arial, sans-serif; padding: 20px; background: #f5f5f5; }
+                .container { max-width: 800px; margin: 0 auto; background: white; padding: 20px; border-radius: 10px; }
+                h1 { color: #333; }
+                .stat { background: #e8f4fd; padding: 15px; margin: 10px 0; border-radius: 5px; }
+                .agent { background: #f0f8f0; padding: 10px; margin: 5px 0; border-radius: 5px; }
             </style>
         </head>
         <body>
             <div class="container">
                 <h1>🌐 Alpha Update Agent - Coordination Server</h1>
                 <hr>
-                <h2>📊 System Status</h2>
-                <div class="stat"><strong>Total Agents Registered:</strong> {len(agents)}</div>
-                <div class="stat"><strong>Agents Online:</strong> {len(online_agents)}</div>
-                <div class="stat"><strong>Pending Tasks:</strong> {len(tasks)}</div>
-                <div class="stat"><strong>Completed Tasks:</strong> {len(results)}</div>
-                <hr>
-                <h2>🤖 Connected Agents</h2>
-                {''.join(f'<div class="agent">{aid} - Last seen: {time.time() - agents[aid]["last_heartbeat"]:.0f}s ago</div>' 
-                         for aid in online_agents) if online_agents else '<div class="agent">No agents connected</div>'}
+                <h2>📊 System Status</h2>""".encode('utf-8')
+
+FALLBACK_FOOTER = """
                 <hr>
                 <p><em>Auto-refresh every 5 seconds | <a href="/api/status">JSON API</a></em></p>
             </div>
         </body>
         </html>
-        """
+""".encode('utf-8')
+
+try:
+    from dashboard import dashboard as dashboard_page
+except ImportError:
+    dashboard_page = None
+
+
+@app.route('/dashboard')
+def dashboard():
+    """Enhanced dashboard page."""
+    if dashboard_page is not None:
+        return dashboard_page()
+    
+    # Fallback to simple dashboard if dashboard module not available
+    total_agents, online_snapshot = snapshot_online_agents()
+    
+    agent_rows = ''.join(
+        f'<div class="agent">{escape(agent_id)} - Last seen: {format_last_seen(seen_ago)}</div>'
+        for agent_id, _, seen_ago in online_snapshot
+    ) or '<div class="agent">No agents connected</div>'
+    
+    middle = f"""
+                <div class="stat"><strong>Total Agents Registered:</strong> {total_agents}</div>
+                <div class="stat"><strong>Agents Online:</strong> {len(online_snapshot)}</div>
+                <div class="stat"><strong>Pending Tasks:</strong> {len(snapshot_tasks())}</div>
+                <div class="stat"><strong>Completed Tasks:</strong> {completed_count()}</div>
+                <hr>
+                <h2>🤖 Connected Agents</h2>
+                {agent_rows}"""
+    
+    return Response(FALLBACK_HEADER + middle.encode('utf-8') + FALLBACK_FOOTER, mimetype='text/html')
 
 
 @app.route('/api/register', methods=['POST'])
 def register_agent():
     """Register a new agent."""
-    data = request.json
+    data = parse_body()
     agent_id = data.get('agent_id')
     
     if not agent_id:
-        return jsonify({'error': 'agent_id required'}), 400
+        return respond({'error': 'agent_id required'}), 400
     
-    with lock:
+    now, now_mono = time.time(), _mono()
+    with agents_lock:
         agents[agent_id] = {
             'info': data,
-            'registered_at': time.time(),
-            'last_heartbeat': time.time()
+            'registered_at': now
         }
+        record_heartbeat(agent_id, now, now_mono)
+        mark_state_changed()
     
     print(f"✓ Agent registered: {agent_id} ({data.get('hostname', 'unknown')})")
     
-    return jsonify({
+    return respond({
         'status': 'registered',
         'agent_id': agent_id,
         'message': 'Registration successful'
@@ -109,47 +340,152 @@ def register_agent():
 @app.route('/api/heartbeat', methods=['POST'])
 def heartbeat():
     """Receive heartbeat from agent."""
-    data = request.json
-    agent_id = data.get('agent_id')
+    # Accept ?agent_id= so the hottest request can skip body parsing entirely
+    agent_id = request.args.get('agent_id') or parse_body().get('agent_id')
     
     if not agent_id:
-        return jsonify({'error': 'agent_id required'}), 400
+        return respond({'error': 'agent_id required'}), 400
     
-    with lock:
+    with agents_lock:
         if agent_id in agents:
-            agents[agent_id]['last_heartbeat'] = time.time()
-            return jsonify({'status': 'ok'})
+            record_heartbeat(agent_id, time.time(), _mono())
+            mark_state_changed()
+            return respond({'status': 'ok'})
         else:
-            return jsonify({'error': 'agent not registered'}), 404
+            return respond({'error': 'agent not registered'}), 404
+
+
+@app.route('/api/heartbeat/bulk', methods=['POST'])
+@app.route('/api/heartbeat/batch', methods=['POST'])
+def heartbeat_bulk():
+    """
+    Receive heartbeats for many agents at once, e.g. from an aggregator in
+    front of agents on the same network. Takes `[{"agent_id": ...}, ...]`
+    or `{"heartbeats": [...]}`.
+    
+    Returns 204, or the ids that are not registered so they can re-register.
+    """
+    updates = parse_body()
+    if isinstance(updates, dict):
+        updates = updates.get('heartbeats')
+    
+    if not isinstance(updates, list) or not all(
+        isinstance(update, dict) and isinstance(update.get('agent_id'), str) for update in updates
+    ):
+        return respond({'error': 'list of {agent_id} required'}), 400
+    
+    unknown = []
+    now, now_mono = time.time(), _mono()
+    with agents_lock:
+        for update in updates:
+            agent_id = update.get('agent_id')
+            if agent_id in agents:
+                record_heartbeat(agent_id, now, now_mono)
+            else:
+                unknown.append(agent_id)
+        
+        if len(unknown) < len(updates):
+            mark_state_changed()
+    
+    if unknown:
+        return respond({'unknown': unknown})
+    return '', 204
 
 
 @app.route('/api/tasks/next', methods=['GET'])
 def get_next_task():
-    """Get next available task for an agent."""
+    """
+    Get next available task for an agent.
+    
+    With `?wait=N` the request blocks for up to N seconds (at most
+    MAX_TASK_WAIT) until a task is queued. Returns 204 when there is no task.
+    """
     agent_id = request.args.get('agent_id')
     
     if not agent_id:
-        return jsonify({'error': 'agent_id required'}), 400
+        return respond({'error': 'agent_id required'}), 400
     
-    with lock:
-        # Find unassigned task
-        for task in tasks:
-            if task['task_id'] not in task_assignments:
-                # Assign task to this agent
-                task_assignments[task['task_id']] = agent_id
-                print(f"📤 Assigned task {task['task_id']} to agent {agent_id}")
-                return jsonify(task)
+    wait = request.args.get('wait', 0, type=float)
+    if not math.isfinite(wait):
+        return respond({'error': 'wait must be a finite number'}), 400
+    wait = min(max(wait, 0), MAX_TASK_WAIT)
+    
+    assigned = assign_tasks(agent_id, 1, wait)
+    if assigned:
+        return respond(assigned[0])
     
     # No tasks available
-    return jsonify({})
+    return '', 204
+
+
+@app.route('/api/poll', methods=['POST'])
+def poll():
+    """
+    Heartbeat and task poll in one request. Takes
+    `{"agent_id": ..., "max": N, "wait": S}` and returns `{"tasks": [...]}`
+    with up to N tasks (default 1, at most MAX_POLL_TASKS; 0 for a heartbeat
+    only), waiting up to S seconds (at most MAX_TASK_WAIT) for the first one.
+    
+    Returns 404 if the agent is not registered, so it can re-register.
+    """
+    data = parse_body()
+    agent_id = data.get('agent_id')
+    
+    if not agent_id:
+        return respond({'error': 'agent_id required'}), 400
+    
+    try:
+        max_tasks = min(max(int(data.get('max', 1)), 0), MAX_POLL_TASKS)
+        wait = float(data.get('wait', 0))
+    except (TypeError, ValueError):
+        return respond({'error': 'max and wait must be numbers'}), 400
+    if not math.isfinite(wait):
+        return respond({'error': 'wait must be a finite number'}), 400
+    wait = min(max(wait, 0), MAX_TASK_WAIT)
+    
+    with agents_lock:
+        if agent_id not in agents:
+            return respond({'error': 'agent not registered'}), 404
+        record_heartbeat(agent_id, time.time(), _mono())
+        mark_state_changed()
+    
+    if not max_tasks:
+        return respond({'tasks': []})
+    return respond({'tasks': assign_tasks(agent_id, max_tasks, wait)})
+
+
+def assign_tasks(agent_id, limit, wait):
+    """
+    Assign up to `limit` of the oldest unassigned tasks to an agent, waiting
+    up to `wait` seconds for the first one to be queued.
+    """
+    assigned = []
+    deadline = _mono() + wait
+    
+    with task_queued:
+        while True:
+            # Take the oldest unassigned tasks, skipping any that already have a result
+            while unassigned and len(assigned) < limit:
+                task = unassigned.popleft()
+                if task['task_id'] in tasks:
+                    # Assign task to this agent
+                    task_assignments[task['task_id']] = agent_id
+                    print(f"📤 Assigned task {task['task_id']} to agent {agent_id}")
+                    assigned.append(task)
+            
+            remaining = deadline - _mono()
+            # Written so that a NaN deadline ends the wait instead of spinning
+            if assigned or not remaining > 0:
+                return assigned
+            task_queued.wait(remaining)
 
 
 @app.route('/api/tasks/submit', methods=['POST'])
 def submit_task():
     """Submit a new task to the queue."""
-    data = request.json
+    data = parse_body()
     
-    task_id = f"task_{int(time.time() * 1000)}"
+    task_id = f"task_{next(task_ids)}"
     task = {
         'task_id': task_id,
         'type': data.get('type', 'compute'),
@@ -158,12 +494,15 @@ def submit_task():
         'submitted_at': time.time()
     }
     
-    with lock:
-        tasks.append(task)
+    with tasks_lock:
+        tasks[task_id] = task
+        unassigned.append(task)
+        task_queued.notify()
+        mark_state_changed()
     
     print(f"✓ New task submitted: {task_id} - {task['description']}")
     
-    return jsonify({
+    return respond({
         'status': 'submitted',
         'task_id': task_id
     })
@@ -172,227 +511,409 @@ def submit_task():
 @app.route('/api/tasks/result', methods=['POST'])
 def submit_result():
     """Receive task result from agent."""
-    data = request.json
+    data = parse_body()
     task_id = data.get('task_id')
     
     if not task_id:
-        return jsonify({'error': 'task_id required'}), 400
+        return respond({'error': 'task_id required'}), 400
     
-    with lock:
+    with tasks_lock, results_lock:
         results[task_id] = data
         # Remove from pending tasks
-        tasks[:] = [t for t in tasks if t['task_id'] != task_id]
+        tasks.pop(task_id, None)
+        task_assignments.pop(task_id, None)
+        mark_state_changed()
     
     print(f"✓ Result received for task {task_id} from agent {data.get('agent_id')}")
     
-    return jsonify({'status': 'received'})
+    return respond({'status': 'received'})
 
 
 @app.route('/api/unregister', methods=['POST'])
 def unregister_agent():
     """Unregister an agent."""
-    data = request.json
+    data = parse_body()
     agent_id = data.get('agent_id')
     
-    with lock:
+    with agents_lock:
         if agent_id in agents:
             del agents[agent_id]
+            online_set.discard(agent_id)
+            mark_state_changed()
             print(f"✓ Agent unregistered: {agent_id}")
     
-    return jsonify({'status': 'unregistered'})
+    return respond({'status': 'unregistered'})
+
+
+def snapshot_agents():
+    """
+    Copy (agent_id, info, last_heartbeat, seconds_since_heartbeat, online) for
+    every agent under `agents_lock`.
+    """
+    with agents_lock:
+        now_mono = _mono()
+        expire_online(now_mono)
+        return [
+            (agent_id, data['info'], data['last_heartbeat'], now_mono - data['heartbeat_mono'], agent_id in online_set)
+            for agent_id, data in agents.items()
+        ]
+
+
+def snapshot_online_agents():
+    """
+    Return the total agent count and (agent_id, info, seconds_since_heartbeat)
+    for online agents only.
+    """
+    with agents_lock:
+        now_mono = _mono()
+        expire_online(now_mono)
+        return len(agents), [
+            (agent_id, agents[agent_id]['info'], now_mono - agents[agent_id]['heartbeat_mono'])
+            for agent_id in online_set
+        ]
+
+
+def snapshot_tasks():
+    """Copy the pending tasks under `tasks_lock`."""
+    with tasks_lock:
+        return list(tasks.values())
+
+
+def completed_count():
+    """Number of task results received."""
+    with results_lock:
+        return len(results)
 
 
 @app.route('/api/status', methods=['GET'])
 def get_status():
     """Get system status as JSON."""
+    etag = state_etag()
+    cached = not_modified(etag)
+    if cached:
+        return cached
+    
+    total_agents, online_snapshot = snapshot_online_agents()
+    pending = snapshot_tasks()
+    
     online_agents = [
         {
             'agent_id': agent_id,
-            'hostname': data['info'].get('hostname'),
-            'last_seen': time.time() - data['last_heartbeat']
+            'hostname': info.get('hostname'),
+            'last_seen': seen_ago
         }
-        for agent_id, data in agents.items()
-        if time.time() - data['last_heartbeat'] < 60
+        for agent_id, info, seen_ago in online_snapshot
     ]
     
-    return jsonify({
-        'total_agents': len(agents),
+    return tag_response(jsonify({
+        'total_agents': total_agents,
         'online_agents': len(online_agents),
-        'pending_tasks': len(tasks),
-        'completed_tasks': len(results),
+        'pending_tasks': len(pending),
+        'completed_tasks': completed_count(),
         'agents': online_agents,
-        'tasks': [{'task_id': t['task_id'], 'type': t['type']} for t in tasks]
-    })
+        'tasks': [{'task_id': t['task_id'], 'type': t['type']} for t in pending]
+    }), etag)
+
+def build_dashboard_data():
+    """Build the dashboard payload: counts, agent list and pending tasks."""
+    # Copy state under each lock briefly, then build the payload lock-free
+    agent_snapshot = snapshot_agents()
+    pending = snapshot_tasks()
+    completed = completed_count()
+    current_time = time.time()
+    
+    # Calculate online agents
+    online_agents = []
+    online_count = 0
+    for agent_id, info, last_heartbeat, last_seen_ago, is_online in agent_snapshot:
+        online_count += is_online
+        
+        online_agents.append({
+            'agent_id': agent_id,
+            'hostname': info.get('hostname', 'Unknown'),
+            'online': is_online,
+            'last_heartbeat': last_heartbeat,
+            'last_seen': last_seen_ago
+        })
+    
+    # Sort agents (online first, then by last seen)
+    online_agents.sort(key=lambda x: (not x['online'], x['last_seen']))
+    
+    # Get pending tasks
+    pending_tasks = []
+    for task in pending:
+        pending_tasks.append({
+            'task_id': task['task_id'],
+            'type': task.get('type', 'unknown'),
+            'description': task.get('description', 'No description'),
+            'submitted_at': task.get('submitted_at', 0)
+        })
+    
+    return {
+        'total_agents': len(agent_snapshot),
+        'online_agents': online_count,
+        'pending_tasks': len(pending),
+        'completed_tasks': completed,
+        'agents': online_agents,
+        'tasks': pending_tasks,
+        'server_time': current_time
+    }
+
+# Serialized /api/dashboard-data body. Last-seen times make it time dependent,
+# so it is shared by all clients for at most a second per state version.
+dashboard_cache = {'key': None, 'body': b''}
+
+def dashboard_data_json():
+    """Return the dashboard payload as JSON bytes, cached per state version and second."""
+    with state_changed:
+        key = (state_version, int(time.time()))
+        if dashboard_cache['key'] == key:
+            return dashboard_cache['body']
+    
+    body = dumps_bytes(build_dashboard_data())
+    
+    with state_changed:
+        dashboard_cache.update(key=key, body=body)
+    return body
 
 @app.route('/api/dashboard-data')
 def dashboard_data():
     """API endpoint for dashboard data."""
-    with lock:
-        current_time = time.time()
-        
-        # Calculate online agents
-        online_agents = []
-        for agent_id, data in agents.items():
-            last_seen_ago = current_time - data['last_heartbeat']
-            is_online = last_seen_ago < 60  # Online if heartbeat within 60 seconds
+    etag = state_etag()
+    cached = not_modified(etag)
+    if cached:
+        return cached
+    return tag_response(Response(dashboard_data_json(), mimetype='application/json'), etag)
+
+@app.route('/api/dashboard-all')
+def dashboard_all():
+    """Dashboard data and resource summary in a single response."""
+    # Splice the two cached bodies together rather than re-serializing them
+    body = b'{"dashboard":' + dashboard_data_json() + b',"resources":' + resources_summary_json() + b'}'
+    return Response(body, mimetype='application/json')
+
+def diff_rows(previous, rows, key):
+    """
+    Diff a list of row dicts against the rows previously sent to a client.
+    
+    Returns:
+        Tuple of (current rows keyed by `key`, {'changed': [...], 'removed': [...]})
+    """
+    current = {row[key]: row for row in rows}
+    changed = [row for row_id, row in current.items() if previous.get(row_id) != row]
+    removed = [row_id for row_id in previous if row_id not in current]
+    return current, {'changed': changed, 'removed': removed}
+
+
+@app.route('/api/stream')
+def dashboard_stream():
+    """
+    Push dashboard updates to the browser as Server-Sent Events.
+    
+    Each event carries the scalar stats plus only the agent/task/resource
+    rows that changed (or were removed) since the previous event.
+    """
+    def event_stream():
+        last_version = None
+        sent_agents, sent_tasks, sent_resources = {}, {}, {}
+        while True:
+            with state_changed:
+                if state_version == last_version:
+                    # Nothing new; wake up on the next change, or refresh
+                    # anyway so last-seen times and online flags stay current
+                    state_changed.wait(timeout=STREAM_REFRESH_INTERVAL)
+                last_version = state_version
             
-            online_agents.append({
-                'agent_id': agent_id,
-                'hostname': data['info'].get('hostname', 'Unknown'),
-                'online': is_online,
-                'last_seen': last_seen_ago,
-                'last_seen_text': format_last_seen(last_seen_ago)
-            })
-        
-        # Sort agents (online first, then by last seen)
-        online_agents.sort(key=lambda x: (not x['online'], x['last_seen']))
-        
-        # Get pending tasks
-        pending_tasks = []
-        for task in tasks:
-            pending_tasks.append({
-                'task_id': task['task_id'],
-                'type': task.get('type', 'unknown'),
-                'description': task.get('description', 'No description'),
-                'submitted_at': task.get('submitted_at', 0)
-            })
-        
-        return jsonify({
-            'total_agents': len(agents),
-            'online_agents': len([a for a in online_agents if a['online']]),
-            'pending_tasks': len(tasks),
-            'completed_tasks': len(results),
-            'agents': online_agents,
-            'tasks': pending_tasks,
-            'server_time': current_time
-        })
+            stats = build_dashboard_data()
+            resource_totals = build_resources_summary()
+            
+            # Relative last-seen fields change every second; the client derives
+            # them from last_heartbeat and server_time instead
+            agent_rows = [
+                {k: v for k, v in agent.items() if k != 'last_seen'}
+                for agent in stats.pop('agents')
+            ]
+            sent_agents, agents_delta = diff_rows(sent_agents, agent_rows, 'agent_id')
+            sent_tasks, tasks_delta = diff_rows(sent_tasks, stats.pop('tasks'), 'task_id')
+            sent_resources, resources_delta = diff_rows(
+                sent_resources, resource_totals.pop('agents'), 'agent_id'
+            )
+            
+            delta = {
+                'version': last_version,
+                'stats': stats,
+                'resource_totals': resource_totals,
+                'agents': agents_delta,
+                'tasks': tasks_delta,
+                'resources': resources_delta
+            }
+            yield b'data: ' + dumps_bytes(delta) + b'\n\n'
+            
+            # Coalesce bursts of heartbeats into one update per interval
+            time.sleep(STREAM_MIN_INTERVAL)
+    
+    return Response(event_stream(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+@functools.lru_cache(maxsize=8192)
+def _format_bucket(value, unit):
+    """Format one bucketed last-seen value; cached since few distinct values occur."""
+    return f"{value}{unit} ago"
+
 
 def format_last_seen(seconds_ago):
     """Format last seen time in human readable format."""
     if seconds_ago < 60:
-        return f"{int(seconds_ago)}s ago"
+        return _format_bucket(int(seconds_ago), 's')
     elif seconds_ago < 3600:
-        return f"{int(seconds_ago // 60)}m ago"
+        return _format_bucket(int(seconds_ago // 60), 'm')
     elif seconds_ago < 86400:
-        return f"{int(seconds_ago // 3600)}h ago"
+        return _format_bucket(int(seconds_ago // 3600), 'h')
     else:
-        return f"{int(seconds_ago // 86400)}d ago"
+        return _format_bucket(int(seconds_ago // 86400), 'd')
 
 
 @app.route('/api/resources/report', methods=['POST'])
 def report_resources():
     """Receive resource information from agents."""
-    data = request.json
+    data = parse_body()
     agent_id = data.get('agent_id')
     
     if not agent_id:
-        return jsonify({'error': 'agent_id required'}), 400
+        return respond({'error': 'agent_id required'}), 400
+    
+    now = time.time()
+    row = summarize_resources(agent_id, data, now)
     
-    with lock:
+    with resources_lock:
         resources[agent_id] = {
             'data': data,
-            'last_updated': time.time()
+            'last_updated': now
         }
+        previous = resource_rows.get(agent_id)
+        if previous is not None:
+            add_to_resource_sums(previous, -1)
+        resource_rows[agent_id] = row
+        add_to_resource_sums(row, 1)
+        heapq.heappush(resource_expiry, (now + RESOURCE_TIMEOUT, agent_id, now))
+        mark_state_changed()
     
     print(f"✓ Resources updated for agent: {agent_id}")
-    return jsonify({'status': 'received'})
+    return respond({'status': 'received'})
+
+def summarize_resources(agent_id, data, last_updated):
+    """Build the dashboard summary row for one agent's resource report."""
+    system = data.get('system', {})
+    cpu = data.get('cpu', {})
+    memory = data.get('memory', {})
+    gpu_info = data.get('gpu', {})
+    
+    return {
+        'agent_id': agent_id,
+        'hostname': system.get('hostname', 'Unknown'),
+        'platform': system.get('platform', 'Unknown'),
+        'cpu_cores': cpu.get('cores_logical', 0),
+        'memory_gb': memory.get('total_gb', 0),
+        'storage_gb': sum(disk.get('total_gb', 0) for disk in data.get('storage', [])),
+        'gpu_available': gpu_info.get('available', False),
+        'gpu_count': gpu_info.get('count', 0),
+        'cpu_usage': cpu.get('usage_percent', 0),
+        'memory_usage': memory.get('usage_percent', 0),
+        'last_updated': last_updated,
+        'uptime_hours': round(system.get('uptime_seconds', 0) / 3600, 1)
+    }
+
+
+def add_to_resource_sums(row, sign):
+    """Add (sign=1) or remove (sign=-1) a row's share of the totals. Caller must hold `resources_lock`."""
+    resource_sums['cpu_cores'] += sign * row['cpu_cores']
+    resource_sums['memory_gb'] += sign * row['memory_gb']
+    resource_sums['storage_gb'] += sign * row['storage_gb']
+    if row['gpu_available']:
+        resource_sums['gpu_count'] += sign * row['gpu_count']
+    if not resource_rows:
+        # Reset so float rounding from repeated add/remove can't accumulate
+        resource_sums.update(cpu_cores=0, memory_gb=0, storage_gb=0, gpu_count=0)
+
+
+def expire_resources(now):
+    """Drop resource reports older than RESOURCE_TIMEOUT. Caller must hold `resources_lock`."""
+    expired = False
+    while resource_expiry and resource_expiry[0][0] <= now:
+        _, agent_id, last_updated = heapq.heappop(resource_expiry)
+        row = resource_rows.get(agent_id)
+        if row is not None and row['last_updated'] == last_updated:
+            del resource_rows[agent_id]
+            add_to_resource_sums(row, -1)
+            expired = True
+    if expired:
+        mark_state_changed()
+
+
+def build_resources_summary():
+    """Summarize resource reports received within the last 5 minutes."""
+    with resources_lock:
+        expire_resources(time.time())
+        agent_summaries = list(resource_rows.values())
+        sums = dict(resource_sums)
+    
+    return {
+        'total_agents': len(agent_summaries),
+        'total_cpu_cores': sums['cpu_cores'],
+        'total_memory_gb': round(sums['memory_gb'], 2),
+        'total_storage_gb': round(sums['storage_gb'], 2),
+        'gpu_count': sums['gpu_count'],
+        'agents': agent_summaries
+    }
+
+# Serialized /api/resources/summary body, reused until the state changes or
+# the oldest included report ages out of the 5 minute window
+summary_cache = {'version': None, 'expires': 0, 'body': b''}
+
+def resources_summary_json():
+    """Return the resource summary as JSON bytes, cached per state version."""
+    with state_changed:
+        if summary_cache['version'] == state_version and time.time() < summary_cache['expires']:
+            return summary_cache['body']
+        version = state_version
+    
+    summary = build_resources_summary()
+    body = dumps_bytes(summary)
+    expires = min((a['last_updated'] + RESOURCE_TIMEOUT for a in summary['agents']), default=float('inf'))
+    
+    with state_changed:
+        summary_cache.update(version=version, expires=expires, body=body)
+    return body
 
 @app.route('/api/resources/summary')
 def get_resources_summary():
     """Get aggregated resource summary across all agents."""
-    with lock:
-        current_time = time.time()
-        
-        # Filter to only recent resource reports (within 5 minutes)
-        recent_resources = {
-            agent_id: data for agent_id, data in resources.items()
-            if current_time - data['last_updated'] < 300  # 5 minutes
-        }
-        
-        if not recent_resources:
-            return jsonify({
-                'total_agents': 0,
-                'total_cpu_cores': 0,
-                'total_memory_gb': 0,
-                'total_storage_gb': 0,
-                'gpu_count': 0,
-                'agents': []
-            })
-        
-        # Aggregate resources
-        total_cpu_cores = 0
-        total_memory_gb = 0
-        total_storage_gb = 0
-        gpu_count = 0
-        agent_summaries = []
-        
-        for agent_id, resource_data in recent_resources.items():
-            data = resource_data['data']
-            
-            # CPU cores
-            cpu_cores = data.get('cpu', {}).get('cores_logical', 0)
-            total_cpu_cores += cpu_cores
-            
-            # Memory
-            memory_gb = data.get('memory', {}).get('total_gb', 0)
-            total_memory_gb += memory_gb
-            
-            # Storage
-            storage_gb = sum(disk.get('total_gb', 0) for disk in data.get('storage', []))
-            total_storage_gb += storage_gb
-            
-            # GPU
-            gpu_info = data.get('gpu', {})
-            if gpu_info.get('available', False):
-                gpu_count += gpu_info.get('count', 0)
-            
-            # Agent summary
-            agent_summaries.append({
-                'agent_id': agent_id,
-                'hostname': data.get('system', {}).get('hostname', 'Unknown'),
-                'platform': data.get('system', {}).get('platform', 'Unknown'),
-                'cpu_cores': cpu_cores,
-                'memory_gb': memory_gb,
-                'storage_gb': storage_gb,
-                'gpu_available': gpu_info.get('available', False),
-                'gpu_count': gpu_info.get('count', 0),
-                'cpu_usage': data.get('cpu', {}).get('usage_percent', 0),
-                'memory_usage': data.get('memory', {}).get('usage_percent', 0),
-                'last_updated': resource_data['last_updated'],
-                'uptime_hours': round(data.get('system', {}).get('uptime_seconds', 0) / 3600, 1)
-            })
-        
-        return jsonify({
-            'total_agents': len(recent_resources),
-            'total_cpu_cores': total_cpu_cores,
-            'total_memory_gb': round(total_memory_gb, 2),
-            'total_storage_gb': round(total_storage_gb, 2),
-            'gpu_count': gpu_count,
-            'agents': agent_summaries
-        })
+    return Response(resources_summary_json(), mimetype='application/json')
 
 @app.route('/api/mining/report', methods=['POST'])
 def report_mining_stats():
     """Receive mining statistics from agents."""
-    data = request.json
+    data = parse_body()
     agent_id = data.get('agent_id')
     
     if not agent_id:
-        return jsonify({'error': 'agent_id required'}), 400
+        return respond({'error': 'agent_id required'}), 400
     
-    with lock:
+    with resources_lock:
         mining_stats[agent_id] = {
             'data': data,
             'last_updated': time.time()
         }
     
     print(f"✓ Mining stats updated for agent: {agent_id} - {data.get('status', 'unknown')}")
-    return jsonify({'status': 'received'})
+    return respond({'status': 'received'})
 
 @app.route('/api/mining/summary')
 def get_mining_summary():
     """Get aggregated mining summary across all agents."""
-    with lock:
+    with resources_lock:
         current_time = time.time()
         
         # Filter to only recent mining reports (within 2 minutes)
@@ -400,56 +921,56 @@ def get_mining_summary():
             agent_id: data for agent_id, data in mining_stats.items()
             if current_time - data['last_updated'] < 120  # 2 minutes
         }
+    
+    if not recent_mining:
+        return jsonify({
+            'total_miners': 0,
+            'total_hashrate': 0,
+            'total_accepted_shares': 0,
+            'total_rejected_shares': 0,
+            'active_miners': []
+        })
+    
+    # Aggregate mining stats
+    total_hashrate = 0
+    total_accepted = 0
+    total_rejected = 0
+    miner_summaries = []
+    
+    for agent_id, mining_data in recent_mining.items():
+        data = mining_data['data']
         
-        if not recent_mining:
-            return jsonify({
-                'total_miners': 0,
-                'total_hashrate': 0,
-                'total_accepted_shares': 0,
-                'total_rejected_shares': 0,
-                'active_miners': []
-            })
+        hashrate = data.get('hashrate', 0)
+        total_hashrate += hashrate
         
-        # Aggregate mining stats
-        total_hashrate = 0
-        total_accepted = 0
-        total_rejected = 0
-        miner_summaries = []
+        accepted = data.get('accepted_shares', 0)
+        total_accepted += accepted
         
-        for agent_id, mining_data in recent_mining.items():
-            data = mining_data['data']
-            
-            hashrate = data.get('hashrate', 0)
-            total_hashrate += hashrate
-            
-            accepted = data.get('accepted_shares', 0)
-            total_accepted += accepted
-            
-            rejected = data.get('rejected_shares', 0)
-            total_rejected += rejected
-            
-            miner_summaries.append({
-                'agent_id': agent_id,
-                'worker_name': data.get('worker_name', 'unknown'),
-                'status': data.get('status', 'unknown'),
-                'hashrate': hashrate,
-                'hashrate_mh': round(hashrate / 1000000, 2) if hashrate > 0 else 0,
-                'accepted_shares': accepted,
-                'rejected_shares': rejected,
-                'uptime': data.get('uptime', 0),
-                'pool': data.get('pool', 'unknown'),
-                'last_updated': mining_data['last_updated']
-            })
+        rejected = data.get('rejected_shares', 0)
+        total_rejected += rejected
         
-        return jsonify({
-            'total_miners': len(recent_mining),
-            'total_hashrate': total_hashrate,
-            'total_hashrate_mh': round(total_hashrate / 1000000, 2),
-            'total_accepted_shares': total_accepted,
-            'total_rejected_shares': total_rejected,
-            'efficiency': round((total_accepted / (total_accepted + total_rejected) * 100), 2) if (total_accepted + total_rejected) > 0 else 0,
-            'active_miners': miner_summaries
+        miner_summaries.append({
+            'agent_id': agent_id,
+            'worker_name': data.get('worker_name', 'unknown'),
+            'status': data.get('status', 'unknown'),
+            'hashrate': hashrate,
+            'hashrate_mh': round(hashrate / 1000000, 2) if hashrate > 0 else 0,
+            'accepted_shares': accepted,
+            'rejected_shares': rejected,
+            'uptime': data.get('uptime', 0),
+            'pool': data.get('pool', 'unknown'),
+            'last_updated': mining_data['last_updated']
         })
+    
+    return jsonify({
+        'total_miners': len(recent_mining),
+        'total_hashrate': total_hashrate,
+        'total_hashrate_mh': round(total_hashrate / 1000000, 2),
+        'total_accepted_shares': total_accepted,
+        'total_rejected_shares': total_rejected,
+        'efficiency': round((total_accepted / (total_accepted + total_rejected) * 100), 2) if (total_accepted + total_rejected) > 0 else 0,
+        'active_miners': miner_summaries
+    })
 
 @app.route('/api/tasks/create-test', methods=['POST'])
 def create_test_tasks():
@@ -474,16 +995,18 @@ def create_test_tasks():
     
     created = []
     for task_data in test_tasks:
-        task_id = f"task_{int(time.time() * 1000000)}"
+        task_id = f"task_{next(task_ids)}"
         task = {
             'task_id': task_id,
             **task_data,
             'submitted_at': time.time()
         }
-        with lock:
-            tasks.append(task)
+        with tasks_lock:
+            tasks[task_id] = task
+            unassigned.append(task)
+            task_queued.notify()
+            mark_state_changed()
         created.append(task_id)
-        time.sleep(0.001)  # Ensure unique IDs
     
     print(f"✓ Created {len(created)} test tasks")
     
@@ -498,17 +1021,31 @@ def cleanup_offline_agents():
     while True:
         time.sleep(60)  # Check every minute
         
-        with lock:
-            current_time = time.time()
+        with agents_lock:
+            now_mono = _mono()
+            expire_online(now_mono)
             offline = [
                 agent_id for agent_id, data in agents.items()
-                if current_time - data['last_heartbeat'] > 300  # 5 minutes
+                if now_mono - data['heartbeat_mono'] > 300  # 5 minutes
             ]
             
             for agent_id in offline:
                 del agents[agent_id]
                 if offline:
                     print(f"⚠ Removed offline agent: {agent_id}")
+            
+            if offline:
+                mark_state_changed()
+        
+        with resources_lock:
+            expire_resources(time.time())
+
+
+def start_cleanup_thread():
+    """Start the background thread that prunes offline agents."""
+    cleanup_thread = threading.Thread(target=cleanup_offline_agents, daemon=True)
+    cleanup_thread.start()
+    return cleanup_thread
 
 
 if __name__ == '__main__':
@@ -532,9 +1069,12 @@ Press Ctrl+C to stop.
     """)
     
     # Start cleanup thread
-    cleanup_thread = threading.Thread(target=cleanup_offline_agents, daemon=True)
-    cleanup_thread.start()
+    start_cleanup_thread()
     
-    # Run Flask server
-    app.run(host='0.0.0.0', port=5000, debug=False)
+    # Run server; with gevent each connection is a greenlet, not a blocked thread
+    if monkey is not None:
+        from gevent.pywsgi import WSGIServer
+        WSGIServer(('0.0.0.0', 5000), app).serve_forever()
+    else:
+        app.run(host='0.0.0.0', port=5000, debug=False)
 
@@ -0,0 +1,361 @@
+// Rows currently on screen, keyed by id -> {data, el}
+const agentRows = new Map();
+const taskRows = new Map();
+const resourceRows = new Map();
+
+// Server clock at the last update; agent last-seen times are relative to it
+let serverTime = 0;
+let summaryEl = null;
+
+// Elements updated on every tick; looked up once since they never change
+const els = {
+    online: document.getElementById('online-count'),
+    total: document.getElementById('total-count'),
+    pending: document.getElementById('pending-count'),
+    completed: document.getElementById('completed-count'),
+    agentsList: document.getElementById('agents-list'),
+    agentsBadge: document.getElementById('agents-badge'),
+    tasksList: document.getElementById('tasks-list'),
+    tasksBadge: document.getElementById('tasks-badge'),
+    totalCpu: document.getElementById('total-cpu-cores'),
+    totalMemory: document.getElementById('total-memory-gb'),
+    totalStorage: document.getElementById('total-storage-gb'),
+    totalGpu: document.getElementById('total-gpu-count'),
+    resourcesList: document.getElementById('resources-list'),
+    resourcesBadge: document.getElementById('resources-badge'),
+    resourceSummary: document.getElementById('resource-summary'),
+    lastUpdate: document.getElementById('last-update'),
+    agentTemplate: document.getElementById('agent-row'),
+    taskTemplate: document.getElementById('task-row'),
+    resourceTemplate: document.getElementById('resource-row'),
+    summaryTemplate: document.getElementById('resource-summary-body')
+};
+
+const EMPTY_AGENTS = '<div class="empty-state"><div class="empty-icon">⚡</div><div>No agents connected</div></div>';
+const EMPTY_TASKS = '<div class="empty-state"><div class="empty-icon">📋</div><div>No pending tasks</div></div>';
+const EMPTY_RESOURCES = '<div class="empty-state"><div class="empty-icon">💻</div><div>No resource data available</div></div>';
+
+function formatLastSeen(seconds) {
+    if (seconds < 60) return `${Math.floor(seconds)}s ago`;
+    if (seconds < 3600) return `${Math.floor(seconds / 60)}m ago`;
+    if (seconds < 86400) return `${Math.floor(seconds / 3600)}h ago`;
+    return `${Math.floor(seconds / 86400)}d ago`;
+}
+
+function updateAgent(el, agent) {
+    setText(el.querySelector('.agent-name'), agent.agent_id);
+    setText(el.querySelector('.agent-host'), agent.hostname);
+    setText(el.querySelector('.last-seen'), formatLastSeen(serverTime - agent.last_heartbeat));
+    el.querySelector('.status-indicator').classList.toggle('offline', !agent.online);
+    setText(el.querySelector('.status-text'), agent.online ? 'ONLINE' : 'OFFLINE');
+    return el;
+}
+
+function updateTask(el, task) {
+    setText(el.querySelector('.task-id'), task.task_id);
+    setText(el.querySelector('.task-type'), task.type);
+    setText(el.querySelector('.task-description'), task.description);
+    return el;
+}
+
+function setWidth(el, percent) {
+    const width = `${percent}%`;
+    if (el.style.width !== width) el.style.width = width;
+}
+
+function updateResource(el, agent) {
+    setText(el.querySelector('.resource-host'), agent.hostname);
+    setText(el.querySelector('.resource-platform'), agent.platform);
+    setText(el.querySelector('.resource-cpu'), agent.cpu_cores);
+    setText(el.querySelector('.resource-memory'), agent.memory_gb);
+    setText(el.querySelector('.resource-storage'), agent.storage_gb);
+    el.querySelector('.resource-gpu').hidden = !agent.gpu_available;
+    setText(el.querySelector('.resource-gpu-count'), agent.gpu_count);
+    setText(el.querySelector('.cpu-usage'), agent.cpu_usage);
+    setWidth(el.querySelector('.cpu-usage-bar'), agent.cpu_usage);
+    setText(el.querySelector('.memory-usage'), agent.memory_usage);
+    setWidth(el.querySelector('.memory-usage-bar'), agent.memory_usage);
+    setText(el.querySelector('.resource-uptime'), agent.uptime_hours);
+    return el;
+}
+
+function updateResourceSummary(totals) {
+    if (!summaryEl) {
+        summaryEl = els.summaryTemplate.content.firstElementChild.cloneNode(true);
+        els.resourceSummary.replaceChildren(summaryEl);
+    }
+    const nodes = totals.total_agents;
+    setText(summaryEl.querySelector('.summary-nodes'), `${nodes} active node${nodes > 1 ? 's' : ''}`);
+    setText(summaryEl.querySelector('.summary-cpu'), totals.total_cpu_cores);
+    setText(summaryEl.querySelector('.summary-memory'), totals.total_memory_gb);
+    setText(summaryEl.querySelector('.summary-storage'), totals.total_storage_gb);
+    setText(summaryEl.querySelector('.summary-gpu'), totals.gpu_count);
+}
+
+function templateView(template, update) {
+    // Rows are cloned from a <template> once and then patched in place; values
+    // only ever go through textContent, so agent-supplied strings can't inject markup
+    return {
+        create: item => update(template.content.firstElementChild.cloneNode(true), item),
+        update
+    };
+}
+
+function setText(el, value) {
+    // Skip the write (and the reflow it may trigger) when nothing changed
+    const text = String(value);
+    if (el.textContent !== text) el.textContent = text;
+}
+
+function diffRows(rows, items, key) {
+    // Client-side equivalent of the server's diff_rows, used for full snapshots
+    const seen = new Set();
+    const changed = [];
+    items.forEach(item => {
+        const id = item[key];
+        const row = rows.get(id);
+        seen.add(id);
+        if (!row || JSON.stringify(row.data) !== JSON.stringify(item)) {
+            changed.push(item);
+        }
+    });
+    const removed = [...rows.keys()].filter(id => !seen.has(id));
+    return { changed, removed };
+}
+
+const agentView = templateView(els.agentTemplate, updateAgent);
+const taskView = templateView(els.taskTemplate, updateTask);
+const resourceView = templateView(els.resourceTemplate, updateResource);
+
+function patchList(container, rows, delta, key, view, emptyHtml) {
+    // Only rows that changed are touched; everything else stays mounted
+    delta.removed.forEach(id => {
+        const row = rows.get(id);
+        if (row) {
+            row.el.remove();
+            rows.delete(id);
+        }
+    });
+
+    // New rows are collected off-document and inserted in one go
+    const added = document.createDocumentFragment();
+    delta.changed.forEach(item => {
+        const id = item[key];
+        const row = rows.get(id);
+        let el;
+        if (row) {
+            el = view.update(row.el, item);
+        } else {
+            el = view.create(item);
+            added.appendChild(el);
+        }
+        rows.set(id, { data: item, el });
+    });
+    container.appendChild(added);
+
+    const empty = container.querySelector('.empty-state');
+    if (rows.size === 0) {
+        if (!empty) container.innerHTML = emptyHtml;
+    } else if (empty) {
+        empty.remove();
+    }
+}
+
+function sortAgentRows(container) {
+    // Online first, then most recently seen; only touch the DOM if out of order
+    const sorted = [...agentRows.values()].sort((a, b) =>
+        (b.data.online - a.data.online) || (b.data.last_heartbeat - a.data.last_heartbeat));
+    const inOrder = sorted.every((row, i) => container.children[i] === row.el);
+    if (!inOrder) {
+        sorted.forEach(row => container.appendChild(row.el));
+    }
+}
+
+function refreshLastSeen() {
+    agentRows.forEach(row => {
+        setText(row.el.querySelector('.last-seen'), formatLastSeen(serverTime - row.data.last_heartbeat));
+    });
+}
+
+function applyDelta(delta) {
+    const stats = delta.stats;
+    const totals = delta.resource_totals;
+    serverTime = stats.server_time;
+
+    // Update stats
+    setText(els.online, stats.online_agents);
+    setText(els.total, stats.total_agents);
+    setText(els.pending, stats.pending_tasks);
+    setText(els.completed, stats.completed_tasks);
+
+    // Update agents list
+    patchList(els.agentsList, agentRows, delta.agents, 'agent_id', agentView, EMPTY_AGENTS);
+    sortAgentRows(els.agentsList);
+    refreshLastSeen();
+    setText(els.agentsBadge, agentRows.size);
+
+    // Update tasks list
+    patchList(els.tasksList, taskRows, delta.tasks, 'task_id', taskView, EMPTY_TASKS);
+    setText(els.tasksBadge, taskRows.size);
+
+    // Update resource stats
+    setText(els.totalCpu, totals.total_cpu_cores);
+    setText(els.totalMemory, totals.total_memory_gb);
+    setText(els.totalStorage, totals.total_storage_gb);
+    setText(els.totalGpu, totals.gpu_count);
+
+    // Update resources list
+    patchList(els.resourcesList, resourceRows, delta.resources, 'agent_id', resourceView, EMPTY_RESOURCES);
+    setText(els.resourcesBadge, resourceRows.size);
+
+    // Update resource summary
+    if (totals.total_agents > 0) {
+        updateResourceSummary(totals);
+    }
+
+    // Update last update time
+    const now = new Date();
+    setText(els.lastUpdate, `UPDATED ${now.toLocaleTimeString()}`);
+}
+
+// JSON is parsed in a Worker when available so large payloads don't block
+// rendering; replies come back in the order the texts were posted
+const PARSER_SOURCE = `self.onmessage = ({ data }) => {
+    try {
+        self.postMessage({ id: data.id, value: JSON.parse(data.text) });
+    } catch (error) {
+        self.postMessage({ id: data.id, error: String(error) });
+    }
+};`;
+const parser = window.Worker && window.Blob && window.URL
+    ? new Worker(URL.createObjectURL(new Blob([PARSER_SOURCE], { type: 'text/javascript' })))
+    : null;
+const pendingParses = new Map();
+let nextParseId = 0;
+
+if (parser) {
+    parser.onmessage = ({ data }) => {
+        const { resolve, reject } = pendingParses.get(data.id);
+        pendingParses.delete(data.id);
+        if ('error' in data) {
+            reject(new Error(data.error));
+        } else {
+            resolve(data.value);
+        }
+    };
+}
+
+function parseJSON(text) {
+    if (!parser) return Promise.resolve(JSON.parse(text));
+    return new Promise((resolve, reject) => {
+        const id = nextParseId++;
+        pendingParses.set(id, { resolve, reject });
+        parser.postMessage({ id, text });
+    });
+}
+
+const pendingRenders = [];
+
+function scheduleRender(render) {
+    // Queue DOM work for the next frame so every write from a tick (or from
+    // several stream events) lands in a single style/layout pass, in order
+    if (pendingRenders.push(render) === 1) {
+        requestAnimationFrame(() => pendingRenders.splice(0).forEach(fn => fn()));
+    }
+}
+
+function applySnapshot(payload) {
+    // Turn a full /api/dashboard-all payload into the same shape as a stream delta
+    const { agents, tasks, ...stats } = payload.dashboard;
+    const { agents: resourceAgents, ...totals } = payload.resources;
+    const stableAgents = agents.map(({ last_seen, ...agent }) => agent);
+
+    applyDelta({
+        stats,
+        resource_totals: totals,
+        agents: diffRows(agentRows, stableAgents, 'agent_id'),
+        tasks: diffRows(taskRows, tasks, 'task_id'),
+        resources: diffRows(resourceRows, resourceAgents, 'agent_id')
+    });
+}
+
+const POLL_INTERVAL = 5000;
+const HIDDEN_POLL_INTERVAL = 30000;
+const MAX_POLL_INTERVAL = 60000;
+
+let pollDelay = POLL_INTERVAL;
+let pollTimer = null;
+let stream = null;
+
+function schedule(delay) {
+    clearTimeout(pollTimer);
+    pollTimer = setTimeout(updateDashboard, delay);
+}
+
+function updateDashboard() {
+    // Background tabs only check in occasionally
+    if (document.hidden) return schedule(HIDDEN_POLL_INTERVAL);
+
+    // Fetch dashboard and resource data in a single request
+    fetch('/api/dashboard-all')
+        .then(response => {
+            if (!response.ok) throw new Error(`HTTP ${response.status}`);
+            return response.text();
+        })
+        .then(parseJSON)
+        .then(payload => {
+            scheduleRender(() => applySnapshot(payload));
+            pollDelay = POLL_INTERVAL;
+        })
+        .catch(error => {
+            console.error('Error fetching dashboard data:', error);
+            // Back off so an unreachable server isn't hit every 5 seconds
+            pollDelay = Math.min(pollDelay * 2, MAX_POLL_INTERVAL);
+        })
+        .finally(() => schedule(pollDelay));
+}
+
+function openStream() {
+    // The server pushes only the rows that changed since its previous event;
+    // EventSource reconnects on its own if the stream drops
+    stream = new EventSource('/api/stream');
+    stream.onopen = () => scheduleRender(() => {
+        // A (re)connected stream starts from scratch, so drop stale rows
+        [agentRows, taskRows, resourceRows].forEach(rows => {
+            rows.forEach(row => row.el.remove());
+            rows.clear();
+        });
+    });
+    stream.onmessage = event => {
+        parseJSON(event.data)
+            .then(delta => scheduleRender(() => applyDelta(delta)))
+            .catch(error => console.error('Error parsing dashboard update:', error));
+    };
+}
+
+function closeStream() {
+    if (stream) {
+        stream.close();
+        stream = null;
+    }
+}
+
+// Hidden tabs release their stream (or slow their polling) and catch up on refocus
+document.addEventListener('visibilitychange', () => {
+    if (window.EventSource) {
+        if (document.hidden) {
+            closeStream();
+        } else if (!stream) {
+            openStream();
+        }
+    } else if (!document.hidden) {
+        pollDelay = POLL_INTERVAL;
+        updateDashboard();
+    }
+});
+
+if (window.EventSource) {
+    openStream();
+} else {
+    updateDashboard();
+}
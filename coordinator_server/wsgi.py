@@ -0,0 +1,13 @@
+"""
+WSGI entry point for running the coordination server under Gunicorn.
+
+    gunicorn -k gevent -w 1 --worker-connections 1000 -b 0.0.0.0:5000 wsgi:app
+
+State is kept in process memory, so run a single worker; the gevent worker
+lets that one process hold thousands of idle heartbeat, long-poll and
+dashboard stream connections.
+"""
+
+from simple_server import app, start_cleanup_thread
+
+start_cleanup_thread()
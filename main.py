@@ -9,11 +9,21 @@ import time
 import json
 import logging
 import importlib
+import compileall
+import heapq
 import signal
+import threading
 from pathlib import Path
 from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor, wait
 from updater import Updater, UpdaterException
 
+# Seconds between tick() calls for modules that don't set TICK_INTERVAL
+DEFAULT_TICK_INTERVAL = 10
+
+# Seconds the main loop waits on a round of ticks before moving on without them
+TICK_TIMEOUT = 30
+
 
 class AlphaAgent:
     """
@@ -31,6 +41,7 @@ class AlphaAgent:
         self.updater = Updater(config_path)
         self.logger = self._setup_logging()
         self.running = True
+        self.stop_event = threading.Event()
         self.loaded_modules = {}
         
         # Setup signal handlers for graceful shutdown
@@ -64,8 +75,9 @@ class AlphaAgent:
     
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals gracefully."""
-        self.logger.info(f"Received signal {signum}, shutting down gracefully...")
+        self.logger.info("Received signal %s, shutting down gracefully...", signum)
         self.running = False
+        self.stop_event.set()
     
     def load_modules(self) -> bool:
         """
@@ -82,7 +94,7 @@ class AlphaAgent:
         
         modules_dir = self.updater.modules_dir
         if not modules_dir.exists():
-            self.logger.warning(f"Modules directory not found: {modules_dir}")
+            self.logger.warning("Modules directory not found: %s", modules_dir)
             return False
         
         # Add modules directory to Python path
@@ -95,7 +107,7 @@ class AlphaAgent:
                 # Remove .py extension if present
                 module_name_clean = module_name.replace('.py', '')
                 
-                self.logger.info(f"Loading module: {module_name_clean}")
+                self.logger.info("Loading module: %s", module_name_clean)
                 
                 # Import or reload module
                 if module_name_clean in self.loaded_modules:
@@ -108,14 +120,30 @@ class AlphaAgent:
                 # Call module's init function if it exists
                 if hasattr(module, 'init'):
                     module.init()
-                    self.logger.info(f"Module {module_name_clean} initialized")
+                    self.logger.info("Module %s initialized", module_name_clean)
                 
             except Exception as e:
-                self.logger.error(f"Failed to load module {module_name}: {e}")
+                self.logger.error("Failed to load module %s: %s", module_name, e)
                 success = False
         
         return success
     
+    def _log_tick_error(self, module_name, future):
+        """Log an exception raised by a module's tick() running on the pool."""
+        if not future.cancelled() and future.exception() is not None:
+            self.logger.error("Error in module %s: %s", module_name, future.exception())
+    
+    def wait_for_ticks(self, tick_futures):
+        """
+        Give ticks still running up to TICK_TIMEOUT to finish, so modules
+        aren't cleaned up (sessions closed, probes stopped) under them.
+        """
+        running = [future for future in tick_futures.values() if not future.done()]
+        if running:
+            _, late = wait(running, timeout=TICK_TIMEOUT)
+            if late:
+                self.logger.warning("%d module tick(s) still running after %ss, unloading anyway", len(late), TICK_TIMEOUT)
+    
     def unload_modules(self):
         """Unload all loaded modules."""
         for module_name, module in self.loaded_modules.items():
@@ -123,9 +151,9 @@ class AlphaAgent:
                 # Call module's cleanup function if it exists
                 if hasattr(module, 'cleanup'):
                     module.cleanup()
-                    self.logger.info(f"Module {module_name} cleaned up")
+                    self.logger.info("Module %s cleaned up", module_name)
             except Exception as e:
-                self.logger.error(f"Error cleaning up module {module_name}: {e}")
+                self.logger.error("Error cleaning up module %s: %s", module_name, e)
         
         self.loaded_modules.clear()
     
@@ -146,16 +174,33 @@ class AlphaAgent:
         if success and "Successfully updated" in message:
             self.logger.info(message)
             self.logger.info("Update applied, restart required")
+            self.precompile()
             return True
         else:
             self.logger.info(message)
             return False
     
-    def restart(self):
-        """Restart the agent to apply updates."""
+    def precompile(self):
+        """
+        Byte-compile updated code before restarting, so the new process
+        imports from __pycache__ instead of compiling every module on startup.
+        """
+        try:
+            compileall.compile_file(str(self.updater.base_dir / 'updater.py'), quiet=1)
+            if self.updater.modules_dir.exists():
+                # In-process: a worker pool would fork while the tick pool and
+                # module threads are running, and there are only a few files
+                compileall.compile_dir(str(self.updater.modules_dir), quiet=1)
+        except Exception as e:
+            self.logger.warning("Bytecode precompile failed: %s", e)
+    
+    def restart(self, tick_futures=None):
+        """Restart the agent to apply updates, after `tick_futures` (if any) finish."""
         self.logger.info("Restarting agent...")
         
         # Unload modules
+        if tick_futures:
+            self.wait_for_ticks(tick_futures)
         self.unload_modules()
         
         # Restart the script
@@ -168,7 +213,7 @@ class AlphaAgent:
         Useful for testing or cron-based execution.
         """
         self.logger.info("=== Alpha Update Agent - Single Run Mode ===")
-        self.logger.info(f"Current version: {self.updater.get_current_version()}")
+        self.logger.info("Current version: %s", self.updater.get_current_version())
         
         # Check for updates
         update_needed = self.check_and_update()
@@ -184,10 +229,10 @@ class AlphaAgent:
         for module_name, module in self.loaded_modules.items():
             if hasattr(module, 'run'):
                 try:
-                    self.logger.info(f"Running module: {module_name}")
+                    self.logger.info("Running module: %s", module_name)
                     module.run()
                 except Exception as e:
-                    self.logger.error(f"Error running module {module_name}: {e}")
+                    self.logger.error("Error running module %s: %s", module_name, e)
         
         # Cleanup
         self.unload_modules()
@@ -200,46 +245,78 @@ class AlphaAgent:
         Checks for updates periodically.
         """
         self.logger.info("=== Alpha Update Agent Starting ===")
-        self.logger.info(f"Current version: {self.updater.get_current_version()}")
+        self.logger.info("Current version: %s", self.updater.get_current_version())
         
         # Load modules on startup
         self.load_modules()
         
         check_interval = self.updater.config.get('check_interval', 3600)
-        last_check = 0
+        next_check = 0
+        
+        # Each module ticks on its own cadence (its TICK_INTERVAL), kept as a
+        # heap of (due_at, module_name); the loop sleeps until the next tick
+        # or update check is due instead of waking on a fixed interval
+        tick_schedule = [
+            (0, module_name) for module_name, module in self.loaded_modules.items()
+            if hasattr(module, 'tick')
+        ]
+        
+        # Ticks run on a small pool so one slow module can't hold up the others
+        # or the update check; a module never has two ticks in flight at once
+        tick_pool = ThreadPoolExecutor(max_workers=min(8, len(tick_schedule) or 1), thread_name_prefix='tick')
+        tick_futures = {}
         
         while self.running:
             try:
-                current_time = time.time()
+                now = time.monotonic()
                 
                 # Check for updates at specified interval
-                if current_time - last_check >= check_interval:
+                if now >= next_check:
                     update_needed = self.check_and_update()
-                    last_check = current_time
+                    next_check = now + check_interval
                     
                     if update_needed:
-                        self.restart()
+                        self.restart(tick_futures)
                         break  # Should not reach here
                 
-                # Run module tasks if they exist
-                for module_name, module in self.loaded_modules.items():
-                    if hasattr(module, 'tick'):
-                        try:
-                            module.tick()
-                        except Exception as e:
-                            self.logger.error(f"Error in module {module_name}: {e}")
+                # Run module tasks that are due
+                due = []
+                while tick_schedule and tick_schedule[0][0] <= now:
+                    _, module_name = heapq.heappop(tick_schedule)
+                    module = self.loaded_modules[module_name]
+                    interval = getattr(module, 'TICK_INTERVAL', DEFAULT_TICK_INTERVAL)
+                    heapq.heappush(tick_schedule, (now + interval, module_name))
+                    
+                    previous = tick_futures.get(module_name)
+                    if previous is not None and not previous.done():
+                        self.logger.warning("Module %s is still running its last tick, skipping", module_name)
+                        continue
+                    
+                    future = tick_pool.submit(module.tick)
+                    future.add_done_callback(lambda f, name=module_name: self._log_tick_error(name, f))
+                    tick_futures[module_name] = future
+                    due.append(module_name)
+                
+                if due:
+                    _, late = wait([tick_futures[name] for name in due], timeout=TICK_TIMEOUT)
+                    for module_name in due:
+                        if tick_futures[module_name] in late:
+                            self.logger.warning("Module %s tick exceeded %ss", module_name, TICK_TIMEOUT)
                 
-                # Sleep to avoid busy waiting
-                time.sleep(10)
+                # Sleep until the next job is due; a shutdown signal wakes us early
+                next_due = min(next_check, tick_schedule[0][0]) if tick_schedule else next_check
+                self.stop_event.wait(max(0, next_due - time.monotonic()))
                 
             except KeyboardInterrupt:
                 self.logger.info("Keyboard interrupt received")
                 break
             except Exception as e:
-                self.logger.error(f"Error in main loop: {e}")
-                time.sleep(10)
+                self.logger.error("Error in main loop: %s", e)
+                self.stop_event.wait(10)
         
         # Cleanup
+        self.wait_for_ticks(tick_futures)
+        tick_pool.shutdown(wait=False)
         self.unload_modules()
         self.logger.info("=== Alpha Update Agent Stopped ===")
 
@@ -0,0 +1,26 @@
+"""
+Agent Identity
+Shared helper so every module reports under the same agent ID.
+
+Not a feature module itself: it has no init()/tick() and is imported by
+modules that talk to the coordinator.
+"""
+
+import functools
+import hashlib
+import socket
+import uuid
+
+
+@functools.lru_cache(maxsize=None)
+def get_agent_id():
+    """
+    Return this machine's agent ID (hostname + MAC address hash).
+    Computed once per process and shared by all modules.
+    
+    MD5 is kept so existing agents keep their IDs; it is only a fingerprint,
+    so it is flagged as non-security use (works on FIPS-restricted builds).
+    """
+    mac = hex(uuid.getnode())[2:]
+    digest = hashlib.md5(mac.encode(), usedforsecurity=False).hexdigest()
+    return f"{socket.gethostname()}_{digest[:8]}"
@@ -8,7 +8,7 @@ import logging
 from pathlib import Path
 
 # Module state
-logger = None
+logger = logging.getLogger('disk_share')
 enabled = False
 shared_path = None
 
@@ -18,9 +18,8 @@ def init():
     Initialize the disk share module.
     Called when the module is loaded.
     """
-    global logger, enabled, shared_path
+    global enabled, shared_path
     
-    logger = logging.getLogger('disk_share')
     logger.info("Disk Share module initializing...")
     
     # In a real implementation, you would:
@@ -33,7 +32,7 @@ def init():
     shared_path.mkdir(parents=True, exist_ok=True)
     
     enabled = True
-    logger.info(f"Disk Share module initialized (path: {shared_path})")
+    logger.info("Disk Share module initialized (path: %s)", shared_path)
 
 
 def tick():
@@ -49,7 +48,8 @@ def tick():
     # - Monitor disk usage
     # - Cleanup old/expired files
     
-    logger.debug("Disk Share: Monitoring storage")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Disk Share: Monitoring storage")
 
 
 def run():
@@ -66,12 +66,12 @@ def run():
     try:
         if shared_path and shared_path.exists():
             # In real implementation, calculate actual free space
-            logger.info(f"Shared storage path: {shared_path}")
+            logger.info("Shared storage path: %s", shared_path)
             logger.info("Storage check complete (placeholder)")
         else:
             logger.warning("Shared storage path not available")
     except Exception as e:
-        logger.error(f"Storage check failed: {e}")
+        logger.error("Storage check failed: %s", e)
 
 
 def cleanup():
@@ -80,15 +80,14 @@ def cleanup():
     """
     global enabled
     
-    if logger:
-        logger.info("Disk Share module shutting down...")
-        
-        # In a real implementation, you would:
-        # - Complete any pending file transfers
-        # - Disconnect from storage network
-        # - Save sync state
-        
-        logger.info("Disk Share module stopped")
+    logger.info("Disk Share module shutting down...")
+    
+    # In a real implementation, you would:
+    # - Complete any pending file transfers
+    # - Disconnect from storage network
+    # - Save sync state
+    
+    logger.info("Disk Share module stopped")
     
     enabled = False
 
@@ -0,0 +1,241 @@
+"""
+GPU Probe
+Shared GPU detection, so NVML is initialized once per process and modules
+loaded together (resource_pool, ravencoin_miner) don't each spawn
+nvidia-smi / rocm-smi.
+
+Not a feature module itself: it has no init()/tick() and is imported by
+modules that need GPU information.
+"""
+
+import csv
+import logging
+import subprocess
+import threading
+import time
+
+try:
+    import pynvml  # Optional: query NVIDIA GPUs in-process instead of spawning nvidia-smi
+except ImportError:
+    pynvml = None
+
+logger = logging.getLogger('gpu_probe')
+
+# The leading index column delimits samples in the -lms stream
+SMI_QUERY = ['nvidia-smi', '--query-gpu=index,name,memory.total,memory.used,utilization.gpu', '--format=csv,noheader,nounits']
+
+# Probe state
+users = 0  # start() calls not yet matched by stop(); shared by the loaded modules
+nvml_handles = None  # NVML device handles, opened once by start() when NVML works
+smi_process = None  # Long-running `nvidia-smi -lms` stream, used when NVML isn't available
+smi_latest = None  # Most recent complete nvidia-smi sample, one CSV row per GPU
+
+# Last probe result, shared by every caller
+lock = threading.Lock()
+cached = None
+cached_at = 0
+
+def start(sample_interval=30):
+    """
+    Open NVML, or failing that an nvidia-smi stream sampling every
+    `sample_interval` seconds. Only the first call does any work; each call
+    must be matched by a stop().
+    """
+    global users
+    
+    with lock:
+        users += 1
+        if users > 1:
+            return
+    
+        init_nvml()
+        if nvml_handles is None:
+            start_smi_stream(sample_interval)
+
+def stop():
+    """Release NVML and stop the nvidia-smi stream once the last user stops."""
+    global users, nvml_handles, smi_process, cached
+    
+    with lock:
+        if users == 0:
+            return
+        users -= 1
+        if users:
+            return
+    
+        if nvml_handles is not None:
+            pynvml.nvmlShutdown()
+            nvml_handles = None
+    
+        if smi_process is not None:
+            smi_process.terminate()
+            try:
+                smi_process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                smi_process.kill()
+                smi_process.wait()
+            smi_process = None
+    
+        cached = None
+
+def probe(ttl=60):
+    """Return GPU information, reusing a result younger than `ttl` seconds."""
+    global cached, cached_at
+    
+    with lock:
+        now = time.monotonic()
+        if cached is None or now - cached_at >= ttl:
+            cached = detect_gpus()
+            cached_at = now
+        return cached
+
+def init_nvml():
+    """Initialize NVML and cache device handles; falls back to nvidia-smi if it can't."""
+    global nvml_handles
+    
+    if pynvml is None:
+        return
+    
+    try:
+        pynvml.nvmlInit()
+        nvml_handles = [pynvml.nvmlDeviceGetHandleByIndex(i) for i in range(pynvml.nvmlDeviceGetCount())]
+    except pynvml.NVMLError as e:
+        logger.debug("NVML unavailable, using nvidia-smi: %s", e)
+
+def get_nvml_devices():
+    """Read name, memory and utilization of each NVIDIA GPU through NVML."""
+    devices = []
+    for i, handle in enumerate(nvml_handles):
+        name = pynvml.nvmlDeviceGetName(handle)
+        memory = pynvml.nvmlDeviceGetMemoryInfo(handle)
+        devices.append({
+            'index': i,
+            'name': name.decode() if isinstance(name, bytes) else name,
+            'memory_total_mb': memory.total // (1024**2),
+            'memory_used_mb': memory.used // (1024**2),
+            'utilization_percent': pynvml.nvmlDeviceGetUtilizationRates(handle).gpu
+        })
+    return devices
+
+def start_smi_stream(sample_interval):
+    """
+    Start one nvidia-smi process that prints a sample every `sample_interval`
+    seconds, so probes read the latest sample instead of spawning nvidia-smi.
+    """
+    global smi_process, smi_latest
+    
+    try:
+        # A one-off query first, to learn the GPU count (lines per sample)
+        result = subprocess.run(SMI_QUERY, capture_output=True, text=True, timeout=5)
+        if result.returncode != 0:
+            return
+    
+        smi_latest = list(parse_smi_rows(result.stdout.splitlines()))
+        if not smi_latest:
+            return
+        
+        smi_process = subprocess.Popen(
+            SMI_QUERY + ['-lms', str(sample_interval * 1000)],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True
+        )
+    except (subprocess.TimeoutExpired, OSError):
+        return
+    
+    threading.Thread(target=read_smi_stream, args=(smi_process, len(smi_latest)), daemon=True).start()
+
+def read_smi_stream(process, gpu_count):
+    """
+    Collect the stream's rows into per-sample batches (runs on its own thread).
+    A sample starts when the GPU index goes back down, so a missing, extra
+    or malformed line can't shift rows into the wrong sample. It is published
+    as soon as it has the expected number of rows, or when the next sample
+    starts if the GPU count changed.
+    """
+    global smi_latest
+    
+    sample = []
+    for row in parse_smi_rows(process.stdout):
+        if sample and int(row[0]) <= int(sample[-1][0]):
+            if len(sample) != gpu_count:
+                smi_latest = sample
+                gpu_count = len(sample)
+            sample = []
+        
+        sample.append(row)
+        if len(sample) == gpu_count:
+            smi_latest = list(sample)
+
+def parse_smi_rows(lines):
+    """
+    Parse nvidia-smi CSV lines lazily (so it can follow the stream), dropping
+    any that aren't a GPU row, e.g. error messages.
+    """
+    return (
+        row for row in csv.reader(lines, skipinitialspace=True)
+        if len(row) >= 5 and row[0].isdigit()
+    )
+
+def parse_smi_int(value):
+    """Parse an integer nvidia-smi field; unsupported fields read "[N/A]"."""
+    return int(value) if value.isdigit() else None
+
+def detect_gpus():
+    """Probe for GPUs through NVML, nvidia-smi or rocm-smi."""
+    gpu_info = {
+        'available': False,
+        'vendor': None,
+        'count': 0,
+        'devices': []
+    }
+    
+    if nvml_handles:
+        try:
+            gpu_info['devices'] = get_nvml_devices()
+            gpu_info['available'] = True
+            gpu_info['vendor'] = 'NVIDIA'
+            gpu_info['count'] = len(gpu_info['devices'])
+            return gpu_info
+        except pynvml.NVMLError as e:
+            logger.debug("NVML query failed, using nvidia-smi: %s", e)
+            gpu_info['devices'] = []
+    
+    try:
+        # Try to detect NVIDIA GPUs; only the fields reported below, as bare CSV.
+        # Prefer the running stream's latest sample over a fresh nvidia-smi.
+        if smi_process is not None and smi_process.poll() is None:
+            rows = smi_latest
+        else:
+            result = subprocess.run(SMI_QUERY, capture_output=True, text=True, timeout=5)
+            rows = list(parse_smi_rows(result.stdout.splitlines())) if result.returncode == 0 else None
+    
+        if rows:
+            gpu_info['available'] = True
+            gpu_info['vendor'] = 'NVIDIA'
+            gpu_info['count'] = len(rows)
+    
+            for row in rows:
+                gpu_info['devices'].append({
+                    'index': int(row[0]),
+                    'name': row[1],
+                    'memory_total_mb': parse_smi_int(row[2]),
+                    'memory_used_mb': parse_smi_int(row[3]),
+                    'utilization_percent': parse_smi_int(row[4])
+                })
+            return gpu_info
+    except (subprocess.TimeoutExpired, OSError):
+        pass
+    
+    try:
+        # Try to detect AMD GPUs
+        result = subprocess.run(['rocm-smi', '--showproductname'],
+                              capture_output=True, text=True, timeout=5)
+        if result.returncode == 0 and 'GPU' in result.stdout:
+            gpu_info['available'] = True
+            gpu_info['vendor'] = 'AMD'
+            gpu_info['count'] = result.stdout.count('GPU')
+    except (subprocess.TimeoutExpired, OSError):
+        pass
+    
+    return gpu_info
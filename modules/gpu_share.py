@@ -46,7 +46,8 @@ def tick():
     # - Execute assigned tasks
     
     # For now, just a simple heartbeat
-    logger.debug("GPU Share: Heartbeat tick")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("GPU Share: Heartbeat tick")
 
 
 def run():
@@ -66,7 +67,7 @@ def run():
         logger.info("Checking GPU availability...")
         logger.info("GPU check complete (placeholder)")
     except Exception as e:
-        logger.error(f"GPU check failed: {e}")
+        logger.error("GPU check failed: %s", e)
 
 
 def cleanup():
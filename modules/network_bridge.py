@@ -45,7 +45,8 @@ def tick():
     # - Update bandwidth statistics
     # - Maintain tunnel health
     
-    logger.debug(f"Network Bridge: {len(connections)} active connections")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Network Bridge: %d active connections", len(connections))
 
 
 def run():
@@ -64,7 +65,7 @@ def run():
         # Placeholder - in real implementation, test actual connections
         logger.info("Network connectivity OK (placeholder)")
     except Exception as e:
-        logger.error(f"Network test failed: {e}")
+        logger.error("Network test failed: %s", e)
 
 
 def cleanup():
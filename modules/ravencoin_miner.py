@@ -10,19 +10,38 @@ import platform
 import os
 import time
 import requests
-import hashlib
-import socket
-import uuid
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pathlib import Path
 import json
 
+import gpu_probe
+from agent_identity import get_agent_id
+
 # Module state
 logger = None
 agent_id = None
 coordinator_url = None
 miner_process = None
 mining_active = False
-last_report = 0
+next_report = 0  # time.monotonic() at which mining stats are next due
+miner_argv = None  # Miner command line, built on the first start and reused on restarts
+
+# How long a GPU detection result is reused by tick(), start_mining() and
+# get_miner_path(); the probe is shared with resource_pool when both are loaded
+GPU_CACHE_TTL = 60  # seconds
+
+# Shared by the miner API and coordinator calls to reuse connections
+session = requests.Session()
+# Retries absorb a reused connection that went stale between reports
+for prefix in ('http://', 'https://'):
+    session.mount(prefix, HTTPAdapter(max_retries=Retry(total=2, backoff_factor=0.2)))
+
+# The miner's local stats API: one kept-alive connection, no retries and a
+# short timeout, since stats are best-effort and the miner is on this host
+MINER_API = '127.0.0.1:4067'
+MINER_API_TIMEOUT = 0.5  # seconds
+session.mount(f'http://{MINER_API}', HTTPAdapter(pool_connections=1, pool_maxsize=1))
 
 # Mining configuration
 MINING_CONFIG = {
@@ -40,10 +59,8 @@ def init():
     
     logger = logging.getLogger('ravencoin_miner')
     
-    # Generate unique agent ID
-    hostname = socket.gethostname()
-    mac = hex(uuid.getnode())[2:]
-    agent_id = f"{hostname}_{hashlib.md5(mac.encode()).hexdigest()[:8]}"
+    # Unique agent ID, shared with the other modules
+    agent_id = get_agent_id()
     
     # Set worker name
     MINING_CONFIG['worker_name'] = agent_id
@@ -53,6 +70,8 @@ def init():
     
     logger.info(f"Ravencoin mining module initializing for agent: {agent_id}")
     
+    gpu_probe.start()
+    
     # Check wallet address
     if not MINING_CONFIG['wallet_address']:
         logger.warning("RVN_WALLET not set! Mining will not start until wallet address is configured.")
@@ -70,49 +89,9 @@ def init():
     logger.info(f"Wallet: {MINING_CONFIG['wallet_address'][:10]}...{MINING_CONFIG['wallet_address'][-10:]}")
     logger.info(f"Worker: {MINING_CONFIG['worker_name']}")
 
-def check_gpu():
-    """Check for GPU availability and type."""
-    gpu_info = {
-        'available': False,
-        'vendor': None,
-        'count': 0,
-        'devices': []
-    }
-    
-    try:
-        # Check for NVIDIA GPU
-        result = subprocess.run(
-            ['nvidia-smi', '--query-gpu=name', '--format=csv,noheader'],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        if result.returncode == 0:
-            gpu_info['available'] = True
-            gpu_info['vendor'] = 'NVIDIA'
-            gpu_info['devices'] = result.stdout.strip().split('\n')
-            gpu_info['count'] = len(gpu_info['devices'])
-            return gpu_info
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        pass
-    
-    try:
-        # Check for AMD GPU
-        result = subprocess.run(
-            ['rocm-smi', '--showproductname'],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        if result.returncode == 0 and 'GPU' in result.stdout:
-            gpu_info['available'] = True
-            gpu_info['vendor'] = 'AMD'
-            gpu_info['count'] = result.stdout.count('GPU')
-            return gpu_info
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        pass
-    
-    return gpu_info
+def check_gpu(force=False):
+    """Check for GPU availability and type, reusing a recent result unless forced."""
+    return gpu_probe.probe(ttl=0 if force else GPU_CACHE_TTL)
 
 def get_miner_path():
     """Get the appropriate miner executable for the system."""
@@ -160,50 +139,58 @@ def download_miner():
     logger.info(f"Extract to: {miners_dir.absolute()}")
     return False
 
-def start_mining():
-    """Start the Ravencoin mining process."""
-    global miner_process, mining_active
-    
-    if not MINING_CONFIG['wallet_address']:
-        logger.error("Cannot start mining: No wallet address configured")
-        return False
-    
-    gpu_info = check_gpu()
-    if not gpu_info['available']:
-        logger.error("Cannot start mining: No GPU detected")
-        return False
-    
-    miner_path = get_miner_path()
-    if not miner_path or not miner_path.exists():
-        logger.warning("Mining software not found")
-        download_miner()
-        return False
-    
-    # Build mining command
-    pool_url = MINING_CONFIG['pool_url']
+def build_miner_argv(miner_path):
+    """Build the miner command line for the configured pool, wallet and worker."""
     wallet = MINING_CONFIG['wallet_address']
     worker = MINING_CONFIG['worker_name']
     
     # Example command for different miners
     # T-Rex: t-rex -a kawpow -o stratum+tcp://pool:port -u wallet.worker -p x
-    cmd = [
+    return (
         str(miner_path),
         '-a', 'kawpow',
-        '-o', pool_url,
+        '-o', MINING_CONFIG['pool_url'],
         '-u', f"{wallet}.{worker}",
         '-p', 'x',
-        '--api-bind-http', '127.0.0.1:4067'  # Local API for stats
-    ]
+        '--api-bind-http', MINER_API  # Local API for stats
+    )
+
+def start_mining():
+    """Start the Ravencoin mining process."""
+    global miner_process, mining_active, miner_argv
+    
+    # Checks and command are only needed once; restarts reuse the command
+    if miner_argv is None:
+        if not MINING_CONFIG['wallet_address']:
+            logger.error("Cannot start mining: No wallet address configured")
+            return False
+        
+        gpu_info = check_gpu()
+        if not gpu_info['available']:
+            logger.error("Cannot start mining: No GPU detected")
+            return False
+        
+        miner_path = get_miner_path()
+        if not miner_path or not miner_path.exists():
+            logger.warning("Mining software not found")
+            download_miner()
+            return False
+        
+        miner_argv = build_miner_argv(miner_path)
+    
+    miner_path = Path(miner_argv[0])
     
     try:
         logger.info(f"Starting miner: {miner_path.name}")
-        logger.info(f"Pool: {pool_url}")
-        logger.info(f"Worker: {worker}")
+        logger.info(f"Pool: {MINING_CONFIG['pool_url']}")
+        logger.info(f"Worker: {MINING_CONFIG['worker_name']}")
         
+        # Output is discarded: stats come from the miner's HTTP API, and an
+        # undrained pipe would fill up and stall the miner
         miner_process = subprocess.Popen(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
+            miner_argv,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
             cwd=miner_path.parent
         )
         
@@ -247,7 +234,7 @@ def get_mining_stats():
     
     # Try to get stats from miner API
     try:
-        response = requests.get('http://127.0.0.1:4067/summary', timeout=2)
+        response = session.get(f'http://{MINER_API}/summary', timeout=MINER_API_TIMEOUT)
         if response.status_code == 200:
             data = response.json()
             return {
@@ -279,7 +266,7 @@ def report_mining_stats():
         stats['worker_name'] = MINING_CONFIG['worker_name']
         stats['pool'] = MINING_CONFIG['pool_url']
         
-        response = requests.post(
+        response = session.post(
             f"{coordinator_url}/api/mining/report",
             json=stats,
             timeout=10
@@ -298,9 +285,9 @@ def report_mining_stats():
 
 def tick():
     """Called periodically by main agent."""
-    global last_report
+    global next_report, mining_active
     
-    current_time = time.time()
+    now = time.monotonic()
     
     # Check if mining should be active
     if MINING_CONFIG['wallet_address'] and not mining_active:
@@ -309,9 +296,9 @@ def tick():
             start_mining()
     
     # Report stats every 60 seconds
-    if mining_active and current_time - last_report > 60:
+    if mining_active and now >= next_report:
         report_mining_stats()
-        last_report = current_time
+        next_report = now + 60
     
     # Check if miner process is still running
     if mining_active and miner_process:
@@ -339,6 +326,8 @@ def cleanup():
     """Clean up on shutdown."""
     logger.info("Ravencoin miner shutting down...")
     stop_mining()
+    gpu_probe.stop()
+    session.close()
 
 # Module metadata
 __version__ = "1.0.0"
@@ -4,22 +4,63 @@ Collects and reports hardware resources (CPU, memory, GPU, storage) from agents.
 This enables distributed resource sharing and monitoring.
 """
 
+import gzip
 import logging
 import psutil
 import platform
 import time
 import json
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, wait
 import os
 import socket
-import uuid
-import hashlib
+
+import gpu_probe
+from agent_identity import get_agent_id
+
+try:
+    import orjson  # Optional: faster serialization of resource reports
+except ImportError:
+    orjson = None
 
 # Module state
 logger = None
 agent_id = None
 coordinator_url = None
-last_report = 0
+
+# Partition usage is read on a small pool so one hung mount (e.g. a dead NFS
+# share) is skipped after DISK_USAGE_TIMEOUT instead of stalling the report
+DISK_USAGE_TIMEOUT = 2  # seconds
+disk_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='disk_usage')
+# mountpoint -> usage future that outlived its report; the mount isn't queried
+# again until it finishes, so a hung mount ties up one worker, not all of them
+disk_usage_pending = {}
+
+# Reports larger than this many bytes of JSON are sent gzipped, unless the
+# coordinator rejected a gzipped report (it predates gzip request bodies)
+GZIP_MIN_SIZE = 1024
+gzip_supported = True
+
+# Expensive, slow-changing stats (socket count, partition list) are refreshed
+# at most this often instead of on every report
+SLOW_STATS_TTL = 300  # seconds
+slow_stats = {}  # name -> (collected_at, value)
+
+# Fixed for the life of the process, so read once
+BOOT_TIME = psutil.boot_time()
+agent_process = psutil.Process()
+
+# Reused across reports so they ride a kept-alive connection
+session = requests.Session()
+# A couple of quick retries cover a pooled connection dropped between reports
+for prefix in ('http://', 'https://'):
+    session.mount(prefix, HTTPAdapter(max_retries=Retry(total=2, backoff_factor=0.2)))
+
+# Seconds between resource reports; the agent's scheduler calls tick() on
+# this cadence, so tick() needs no clock checks of its own
+TICK_INTERVAL = 30
 
 def init():
     """Initialize resource pooling module."""
@@ -27,29 +68,59 @@ def init():
     
     logger = logging.getLogger('resource_pool')
     
-    # Generate unique agent ID
-    hostname = socket.gethostname()
-    mac = hex(uuid.getnode())[2:]
-    agent_id = f"{hostname}_{hashlib.md5(mac.encode()).hexdigest()[:8]}"
+    # Unique agent ID, shared with the other modules
+    agent_id = get_agent_id()
     
     # Get coordinator URL
     coordinator_url = os.getenv('COORDINATOR_URL', 'http://localhost:5000')
     
     logger.info(f"Resource pool module initializing for agent: {agent_id}")
     
-    # Report initial resources
-    report_resources()
+    # Prime the CPU counters so the first report's non-blocking sample is meaningful
+    psutil.cpu_percent(interval=None)
+    
+    # Shared with ravencoin_miner when both are loaded; samples GPUs at the report cadence
+    gpu_probe.start(sample_interval=TICK_INTERVAL)
+    
+    # The first report is sent by the first tick(), which the agent runs on its
+    # tick pool right after loading, so module loading doesn't wait on it
+
+def cached_stat(name, collect):
+    """Return `collect()`, reusing the previous value for up to SLOW_STATS_TTL seconds."""
+    now = time.monotonic()
+    entry = slow_stats.get(name)
+    if entry is None or now - entry[0] >= SLOW_STATS_TTL:
+        entry = slow_stats[name] = (now, collect())
+    return entry[1]
+
+def count_python_processes(pids):
+    """Count processes whose name contains 'python'."""
+    if not os.path.isdir('/proc'):
+        return sum(1 for p in psutil.process_iter(['name']) if 'python' in (p.info['name'] or '').lower())
+    
+    # On Linux read only /proc/<pid>/comm, skipping psutil's per-process setup
+    count = 0
+    for pid in pids:
+        try:
+            with open(f'/proc/{pid}/comm') as f:
+                if 'python' in f.read().lower():
+                    count += 1
+        except OSError:
+            continue
+    return count
 
 def get_system_resources():
     """Collect comprehensive system resource information."""
     try:
-        # CPU information
+        # CPU information; usage is averaged since the previous report rather
+        # than sampled by blocking for a second
+        cpu_freq = psutil.cpu_freq()
         cpu_info = {
             'cores_physical': psutil.cpu_count(logical=False),
             'cores_logical': psutil.cpu_count(logical=True),
-            'usage_percent': psutil.cpu_percent(interval=1),
-            'frequency_current': psutil.cpu_freq().current if psutil.cpu_freq() else None,
-            'frequency_max': psutil.cpu_freq().max if psutil.cpu_freq() else None,
+            'usage_percent': psutil.cpu_percent(interval=None),
+            'frequency_current': cpu_freq.current if cpu_freq else None,
+            'frequency_max': cpu_freq.max if cpu_freq else None,
             'load_avg': psutil.getloadavg() if hasattr(psutil, 'getloadavg') else None
         }
         
@@ -64,10 +135,24 @@ def get_system_resources():
         }
         
         # Storage information
+        usage_futures = []
+        for partition in cached_stat('partitions', psutil.disk_partitions):
+            pending = disk_usage_pending.get(partition.mountpoint)
+            if pending is not None and not pending.done():
+                logger.debug(f"Skipping unresponsive mount: {partition.mountpoint}")
+                continue
+            disk_usage_pending.pop(partition.mountpoint, None)
+            usage_futures.append((partition, disk_pool.submit(psutil.disk_usage, partition.mountpoint)))
+        wait([future for _, future in usage_futures], timeout=DISK_USAGE_TIMEOUT)
+        
         storage_info = []
-        for partition in psutil.disk_partitions():
+        for partition, future in usage_futures:
+            if not future.done():
+                logger.debug(f"Skipping unresponsive mount: {partition.mountpoint}")
+                disk_usage_pending[partition.mountpoint] = future
+                continue
             try:
-                partition_usage = psutil.disk_usage(partition.mountpoint)
+                partition_usage = future.result()
                 storage_info.append({
                     'device': partition.device,
                     'mountpoint': partition.mountpoint,
@@ -81,11 +166,12 @@ def get_system_resources():
                 continue
         
         # Network information
+        net_io = psutil.net_io_counters()
         network_info = {
             'interfaces': len(psutil.net_if_addrs()),
-            'connections': len(psutil.net_connections()),
-            'bytes_sent': psutil.net_io_counters().bytes_sent if psutil.net_io_counters() else 0,
-            'bytes_recv': psutil.net_io_counters().bytes_recv if psutil.net_io_counters() else 0
+            'connections': cached_stat('connections', lambda: len(psutil.net_connections(kind='inet'))),
+            'bytes_sent': net_io.bytes_sent if net_io else 0,
+            'bytes_recv': net_io.bytes_recv if net_io else 0
         }
         
         # GPU information (if available)
@@ -99,15 +185,16 @@ def get_system_resources():
             'architecture': platform.machine(),
             'processor': platform.processor(),
             'hostname': socket.gethostname(),
-            'boot_time': psutil.boot_time(),
-            'uptime_seconds': time.time() - psutil.boot_time()
+            'boot_time': BOOT_TIME,
+            'uptime_seconds': time.time() - BOOT_TIME
         }
         
         # Process information
+        pids = psutil.pids()
         process_info = {
-            'total_processes': len(psutil.pids()),
-            'python_processes': len([p for p in psutil.process_iter(['name']) if 'python' in p.info['name'].lower()]),
-            'memory_usage_mb': round(psutil.Process().memory_info().rss / (1024**2), 2)
+            'total_processes': len(pids),
+            'python_processes': count_python_processes(pids),
+            'memory_usage_mb': round(agent_process.memory_info().rss / (1024**2), 2)
         }
         
         return {
@@ -131,62 +218,48 @@ def get_system_resources():
         }
 
 def get_gpu_info():
-    """Get GPU information if available."""
-    gpu_info = {
-        'available': False,
-        'count': 0,
-        'devices': []
-    }
+    """Get GPU information if available; fresh enough for every report."""
+    return gpu_probe.probe(ttl=TICK_INTERVAL / 2)
+
+def encode_report(payload, compress=True):
+    """Serialize a report as JSON, gzipped once it exceeds GZIP_MIN_SIZE; returns (body, headers)."""
+    body = orjson.dumps(payload) if orjson is not None else json.dumps(payload).encode('utf-8')
+    headers = {'Content-Type': 'application/json'}
     
-    try:
-        # Try to detect NVIDIA GPUs
-        import subprocess
-        result = subprocess.run(['nvidia-smi', '--query-gpu=name,memory.total,memory.used,utilization.gpu', '--format=csv,noheader,nounits'], 
-                              capture_output=True, text=True, timeout=5)
-        if result.returncode == 0:
-            gpu_info['available'] = True
-            gpu_info['vendor'] = 'NVIDIA'
-            lines = result.stdout.strip().split('\n')
-            gpu_info['count'] = len(lines)
-            
-            for i, line in enumerate(lines):
-                parts = line.split(', ')
-                if len(parts) >= 4:
-                    gpu_info['devices'].append({
-                        'index': i,
-                        'name': parts[0],
-                        'memory_total_mb': int(parts[1]),
-                        'memory_used_mb': int(parts[2]),
-                        'utilization_percent': int(parts[3])
-                    })
-    except (subprocess.TimeoutExpired, FileNotFoundError, Exception):
-        pass
+    if compress and len(body) > GZIP_MIN_SIZE:
+        body = gzip.compress(body, compresslevel=1)
+        headers['Content-Encoding'] = 'gzip'
     
-    try:
-        # Try to detect AMD GPUs
-        import subprocess
-        result = subprocess.run(['rocm-smi', '--showmemuse', '--showuse'], 
-                              capture_output=True, text=True, timeout=5)
-        if result.returncode == 0 and 'GPU' in result.stdout:
-            gpu_info['available'] = True
-            gpu_info['vendor'] = 'AMD'
-            gpu_info['count'] = result.stdout.count('GPU')
-    except (subprocess.TimeoutExpired, FileNotFoundError, Exception):
-        pass
-    
-    return gpu_info
+    return body, headers
 
 def report_resources():
     """Report current system resources to coordinator."""
+    global gzip_supported
+    
     try:
-        resources = get_system_resources()
+        report = get_system_resources()
+        body, headers = encode_report(report, compress=gzip_supported)
         
-        response = requests.post(
+        response = session.post(
             f"{coordinator_url}/api/resources/report",
-            json=resources,
+            data=body,
+            headers=headers,
             timeout=10
         )
         
+        # A coordinator without gzip request support can't parse the body;
+        # resend it uncompressed and stop compressing for this run
+        if response.status_code in (400, 415) and 'Content-Encoding' in headers:
+            logger.info("Coordinator rejected a gzipped report, sending reports uncompressed")
+            gzip_supported = False
+            body, headers = encode_report(report, compress=False)
+            response = session.post(
+                f"{coordinator_url}/api/resources/report",
+                data=body,
+                headers=headers,
+                timeout=10
+            )
+        
         if response.status_code == 200:
             logger.debug(f"Resources reported successfully")
             return True
@@ -199,15 +272,8 @@ def report_resources():
         return False
 
 def tick():
-    """Called periodically to update resource information."""
-    global last_report
-    
-    current_time = time.time()
-    
-    # Report resources every 30 seconds
-    if current_time - last_report > 30:
-        report_resources()
-        last_report = current_time
+    """Called every TICK_INTERVAL seconds to report resource information."""
+    report_resources()
 
 def run():
     """Called in single-run mode to report resources once."""
@@ -217,6 +283,8 @@ def run():
 def cleanup():
     """Clean up on shutdown."""
     logger.info("Resource pool module shutting down...")
+    gpu_probe.stop()
+    session.close()
 
 # Module metadata
 __version__ = "1.0.0"
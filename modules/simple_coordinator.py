@@ -11,33 +11,106 @@ All communication is outbound from agents (works through NAT/firewalls).
 """
 
 import logging
+import os
+import sys
+import psutil
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import socket
 import json
+import random
 import time
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError, wait
 from pathlib import Path
 
+from agent_identity import get_agent_id
+
+try:
+    import orjson  # Optional: faster serialization of requests and responses
+except ImportError:
+    orjson = None
+
 # Module state
 logger = None
 agent_id = None
 coordinator_url = None
-last_heartbeat = 0
+api_urls = {}  # Endpoint name -> full URL, built once in init()
+capabilities = None  # Host details sent on registration, read once in init()
+agent_info = None  # Static part of the 'info' task result, read once in init()
+
+JSON_HEADERS = {'Content-Type': 'application/json'}
+
+# Tasks run on their own pool so a slow task doesn't hold up tick() (and the
+# agent loop waiting on it); each poll asks only for as many as there are
+# free workers, and doubles as the heartbeat
+MAX_RUNNING_TASKS = 4
+task_pool = ThreadPoolExecutor(max_workers=MAX_RUNNING_TASKS, thread_name_prefix='coord_task')
+task_futures = set()  # Submitted tasks that may still be running
+
+# Seconds a task may run (unless it sets its own 'timeout') before it is
+# reported as timed out and its worker is freed for the next task
+TASK_TIMEOUT = 60
+# Seconds the coordinator may hold a poll open waiting for a task. Kept at 0
+# because the agent loop waits for each round of ticks, so a held poll would
+# delay the other modules' ticks
+POLL_WAIT = 0
+
+# While the coordinator is unreachable, polls back off exponentially (with
+# jitter, so a fleet doesn't retry in lockstep) instead of failing every tick
+POLL_BACKOFF_MIN = 10  # seconds
+POLL_BACKOFF_MAX = 300
+poll_backoff = 0  # Current backoff; 0 while the coordinator is reachable
+next_poll = 0  # time.monotonic() before which tick() doesn't poll
+# Cleared when the coordinator turns out to predate /api/poll; polls then use
+# the separate /api/heartbeat and /api/tasks/next requests instead
+poll_supported = True
+
+# One keep-alive connection pool for all requests, instead of a new TCP
+# (and TLS) handshake per heartbeat/poll/report
+session = requests.Session()
+# Retry once or twice on connection errors, e.g. a kept-alive connection the
+# coordinator has already closed
+for prefix in ('http://', 'https://'):
+    session.mount(prefix, HTTPAdapter(max_retries=Retry(total=2, backoff_factor=0.2)))
 
 def init():
     """Initialize coordinator connection."""
-    global logger, agent_id, coordinator_url
+    global logger, agent_id, coordinator_url, capabilities, agent_info
     
     logger = logging.getLogger('simple_coordinator')
     
-    # Generate unique agent ID (hostname + MAC address hash)
-    import hashlib
-    hostname = socket.gethostname()
-    mac = hex(uuid.getnode())[2:]
-    agent_id = f"{hostname}_{hashlib.md5(mac.encode()).hexdigest()[:8]}"
+    # Unique agent ID (hostname + MAC address hash)
+    agent_id = get_agent_id()
     
     # Get coordinator URL from environment or config
-    import os
     coordinator_url = os.getenv('COORDINATOR_URL', 'http://localhost:5000')
+    api_urls.update(
+        register=f"{coordinator_url}/api/register",
+        poll=f"{coordinator_url}/api/poll",
+        heartbeat=f"{coordinator_url}/api/heartbeat",
+        next_task=f"{coordinator_url}/api/tasks/next",
+        result=f"{coordinator_url}/api/tasks/result",
+        unregister=f"{coordinator_url}/api/unregister"
+    )
+    
+    # Host details don't change while the agent runs, so look them up once
+    hostname = socket.gethostname()
+    capabilities = {
+        'agent_id': agent_id,
+        'hostname': hostname,
+        'platform': os.name,
+        'cpu_cores': os.cpu_count(),
+        'memory_gb': round(psutil.virtual_memory().total / (1024**3), 2),
+        'python_version': f"{sys.version_info.major}.{sys.version_info.minor}",
+    }
+    agent_info = {
+        'agent_id': agent_id,
+        'hostname': hostname,
+        'platform': os.name,
+        'cwd': str(Path.cwd())
+    }
     
     logger.info(f"Coordinator module initializing as: {agent_id}")
     
@@ -49,24 +122,22 @@ def init():
         logger.error(f"Failed to register with coordinator: {e}")
         logger.info("Will retry on next tick...")
 
+def encode_json(payload):
+    """Serialize a request body as JSON bytes, with orjson when it's installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload)
+        except TypeError:
+            pass  # e.g. an int beyond 64 bits in a task result; json handles those
+    return json.dumps(payload).encode('utf-8')
+
 def register_agent():
     """Register this agent with the coordination server."""
-    import os
-    import psutil
-    
-    capabilities = {
-        'agent_id': agent_id,
-        'hostname': socket.gethostname(),
-        'platform': os.name,
-        'cpu_cores': os.cpu_count(),
-        'memory_gb': round(psutil.virtual_memory().total / (1024**3), 2) if 'psutil' in dir() else 'unknown',
-        'python_version': f"{sys.version_info.major}.{sys.version_info.minor}",
-    }
-    
     try:
-        response = requests.post(
-            f"{coordinator_url}/api/register",
-            json=capabilities,
+        response = session.post(
+            api_urls['register'],
+            data=encode_json(capabilities),
+            headers=JSON_HEADERS,
             timeout=5
         )
         
@@ -83,53 +154,113 @@ def register_agent():
 def tick():
     """
     Periodically called by main agent.
-    - Send heartbeat
-    - Check for new tasks
-    - Execute and report results
+    - Poll the coordinator (heartbeat and new tasks in one request)
+    - Hand tasks to the task pool, which executes and reports them
     """
-    global last_heartbeat
+    global poll_backoff, next_poll
     
-    current_time = time.time()
+    now = time.monotonic()
+    if now < next_poll:
+        return
     
-    # Send heartbeat every 30 seconds
-    if current_time - last_heartbeat > 30:
-        send_heartbeat()
-        last_heartbeat = current_time
+    task_futures.difference_update([future for future in task_futures if future.done()])
     
-    # Check for tasks
-    check_for_tasks()
+    tasks = poll(max_tasks=MAX_RUNNING_TASKS - len(task_futures))
+    if tasks is None:
+        poll_backoff = min(max(poll_backoff * 2, POLL_BACKOFF_MIN), POLL_BACKOFF_MAX)
+        next_poll = now + poll_backoff * random.uniform(0.8, 1.2)
+        logger.debug(f"Coordinator unreachable, next poll in {next_poll - now:.0f}s")
+        return
+    poll_backoff = 0
+    
+    for task in tasks:
+        logger.info(f"📥 Received task: {task['task_id']} - {task.get('description', 'No description')}")
+        task_futures.add(task_pool.submit(run_task, task))
+
+def run_task(task):
+    """Execute a task and submit its result (runs on task_pool)."""
+    result = execute_task(task)
+    submit_result(result)
 
-def send_heartbeat():
-    """Send heartbeat to coordinator to show agent is alive."""
+def poll(max_tasks=MAX_RUNNING_TASKS, wait=POLL_WAIT):
+    """
+    Send a heartbeat and fetch up to `max_tasks` queued tasks in one request.
+    Re-registers if the coordinator no longer knows this agent.
+    
+    Returns the tasks, or None if the coordinator couldn't be reached.
+    """
+    global poll_supported
+    
+    if not poll_supported:
+        return legacy_poll(max_tasks)
+    
     try:
-        response = requests.post(
-            f"{coordinator_url}/api/heartbeat",
-            json={'agent_id': agent_id, 'timestamp': time.time()},
-            timeout=3
+        response = session.post(
+            api_urls['poll'],
+            data=encode_json({'agent_id': agent_id, 'max': max_tasks, 'wait': wait}),
+            headers=JSON_HEADERS,
+            timeout=wait + 5
         )
-        logger.debug(f"Heartbeat sent")
+        
+        if response.status_code == 404:
+            # An unknown agent gets a JSON error; a missing route gets the
+            # server's HTML 404, from a coordinator older than /api/poll
+            if 'json' not in response.headers.get('Content-Type', ''):
+                logger.info("Coordinator has no /api/poll, using /api/heartbeat and /api/tasks/next")
+                poll_supported = False
+                return legacy_poll(max_tasks)
+            
+            logger.info("Coordinator doesn't know this agent, re-registering")
+            register_agent()
+            return []
+        
+        if response.status_code == 200:
+            data = orjson.loads(response.content) if orjson is not None else response.json()
+            return data.get('tasks', [])
+        
+        logger.debug(f"Poll returned status {response.status_code}")
     except Exception as e:
-        logger.debug(f"Heartbeat failed: {e}")
+        logger.debug(f"Poll failed: {e}")
+    
+    return None
 
-def check_for_tasks():
-    """Check if coordinator has any tasks for this agent."""
+def legacy_poll(max_tasks):
+    """
+    poll() for coordinators without /api/poll: a heartbeat, then one
+    /api/tasks/next request per task wanted.
+    """
     try:
-        response = requests.get(
-            f"{coordinator_url}/api/tasks/next",
-            params={'agent_id': agent_id},
+        response = session.post(
+            api_urls['heartbeat'],
+            data=encode_json({'agent_id': agent_id, 'timestamp': time.time()}),
+            headers=JSON_HEADERS,
             timeout=5
         )
         
-        if response.status_code == 200:
-            task = response.json()
-            
-            if task and task.get('task_id'):
-                logger.info(f"📥 Received task: {task['task_id']} - {task.get('description', 'No description')}")
-                result = execute_task(task)
-                submit_result(result)
+        if response.status_code == 404:
+            logger.info("Coordinator doesn't know this agent, re-registering")
+            register_agent()
+            return []
+        
+        if response.status_code != 200:
+            logger.debug(f"Heartbeat returned status {response.status_code}")
+            return None
         
+        tasks = []
+        while len(tasks) < max_tasks:
+            response = session.get(api_urls['next_task'], params={'agent_id': agent_id}, timeout=5)
+            if response.status_code != 200:
+                break  # 204: no task queued
+            
+            task = response.json()
+            if not task or not task.get('task_id'):
+                break
+            tasks.append(task)
+        return tasks
     except Exception as e:
-        logger.debug(f"Task check failed: {e}")
+        logger.debug(f"Poll failed: {e}")
+    
+    return None
 
 def execute_task(task):
     """
@@ -147,24 +278,8 @@ def execute_task(task):
     logger.info(f"🔧 Executing task {task_id} (type: {task_type})")
     
     try:
-        # Task execution logic based on type
-        if task_type == 'ping':
-            result_data = {'message': 'pong', 'agent_id': agent_id}
-            status = 'completed'
-        
-        elif task_type == 'compute':
-            # Example: Simple computation task
-            result_data = perform_computation(task.get('params', {}))
-            status = 'completed'
-        
-        elif task_type == 'info':
-            # Return agent information
-            result_data = get_agent_info()
-            status = 'completed'
-        
-        else:
-            result_data = {'error': f'Unknown task type: {task_type}'}
-            status = 'failed'
+        timeout = float(task.get('timeout', TASK_TIMEOUT))
+        status, result_data = run_with_timeout(handle_task, task_type, task, timeout=timeout)
         
         logger.info(f"✓ Task {task_id} completed")
         
@@ -175,6 +290,16 @@ def execute_task(task):
             'result': result_data,
             'completed_at': time.time()
         }
+    
+    except TimeoutError:
+        logger.error(f"Task {task_id} timed out after {timeout}s")
+        return {
+            'task_id': task_id,
+            'agent_id': agent_id,
+            'status': 'timeout',
+            'error': f'Task exceeded {timeout}s',
+            'completed_at': time.time()
+        }
         
     except Exception as e:
         logger.error(f"Task {task_id} failed: {e}")
@@ -186,13 +311,45 @@ def execute_task(task):
             'completed_at': time.time()
         }
 
+def handle_task(task_type, task):
+    """Run a task by type; returns (status, result_data)."""
+    if task_type == 'ping':
+        return 'completed', {'message': 'pong', 'agent_id': agent_id}
+    
+    elif task_type == 'compute':
+        # Example: Simple computation task
+        return 'completed', perform_computation(task.get('params', {}))
+    
+    elif task_type == 'info':
+        # Return agent information
+        return 'completed', get_agent_info()
+    
+    return 'failed', {'error': f'Unknown task type: {task_type}'}
+
+def run_with_timeout(func, *args, timeout):
+    """
+    Call `func(*args)` on its own daemon thread and wait up to `timeout`
+    seconds for it, raising TimeoutError after that.
+    
+    Threads can't be killed, so a timed-out call keeps running in the
+    background; being a daemon thread, it never blocks agent shutdown.
+    """
+    future = Future()
+    
+    def target():
+        try:
+            future.set_result(func(*args))
+        except Exception as e:
+            future.set_exception(e)
+    
+    threading.Thread(target=target, daemon=True, name='coord_task_run').start()
+    return future.result(timeout=timeout)
+
 def perform_computation(params):
     """Example computation task."""
-    import time
-    
-    # Simulate some work
-    n = params.get('n', 100)
-    result = sum(i**2 for i in range(n))
+    # Sum of i**2 for i in range(n), in closed form
+    n = int(params.get('n', 100))
+    result = (n - 1) * n * (2 * n - 1) // 6 if n > 0 else 0
     
     return {
         'computation': f'sum of squares up to {n}',
@@ -201,22 +358,15 @@ def perform_computation(params):
 
 def get_agent_info():
     """Get current agent information."""
-    import os
-    
-    return {
-        'agent_id': agent_id,
-        'hostname': socket.gethostname(),
-        'platform': os.name,
-        'cwd': str(Path.cwd()),
-        'timestamp': time.time()
-    }
+    return {**agent_info, 'timestamp': time.time()}
 
 def submit_result(result):
     """Submit task results back to coordinator."""
     try:
-        response = requests.post(
-            f"{coordinator_url}/api/tasks/result",
-            json=result,
+        response = session.post(
+            api_urls['result'],
+            data=encode_json(result),
+            headers=JSON_HEADERS,
             timeout=10
         )
         
@@ -232,32 +382,34 @@ def run():
     """Called when running in single-execution mode."""
     logger.info("Running coordinator in single-execution mode")
     
-    # Register and check once
+    # Register and poll once
     register_agent()
-    send_heartbeat()
-    check_for_tasks()
+    tick()
+    wait(task_futures)
 
 def cleanup():
     """Clean up on shutdown."""
     logger.info("Coordinator module shutting down...")
     
+    # Let running tasks finish and report before unregistering
+    task_pool.shutdown(wait=True)
+    
     # Unregister from coordinator
     try:
-        requests.post(
-            f"{coordinator_url}/api/unregister",
-            json={'agent_id': agent_id},
+        session.post(
+            api_urls['unregister'],
+            data=encode_json({'agent_id': agent_id}),
+            headers=JSON_HEADERS,
             timeout=3
         )
         logger.info("✓ Unregistered from coordinator")
     except:
         pass
+    
+    session.close()
 
 # Module metadata
 __version__ = "1.0.0"
 __description__ = "Simple coordinator for distributed task execution"
 __author__ = "Alpha Update Agent"
 
-# Required imports
-import sys
-import uuid
-
@@ -14,9 +14,13 @@ import shutil
 
 def calculate_sha256(file_path):
     """Calculate SHA256 checksum of a file."""
-    sha256_hash = hashlib.sha256()
     with open(file_path, 'rb') as f:
-        for chunk in iter(lambda: f.read(4096), b""):
+        # Python 3.11+ hashes the file in C, without a Python-level read loop
+        if hasattr(hashlib, 'file_digest'):
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+        
+        sha256_hash = hashlib.sha256()
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
             sha256_hash.update(chunk)
     return sha256_hash.hexdigest()
 
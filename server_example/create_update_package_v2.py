@@ -10,6 +10,26 @@ import hashlib
 import json
 from pathlib import Path
 
+class HashingWriter:
+    """
+    Write-only file wrapper that hashes bytes as they are written.
+    
+    It deliberately has no seek(), so zipfile streams entries with data
+    descriptors instead of seeking back to patch headers, which keeps the
+    hash equal to the bytes on disk.
+    """
+    
+    def __init__(self, f, hash_obj):
+        self.f = f
+        self.hash = hash_obj
+    
+    def write(self, data):
+        self.hash.update(data)
+        return self.f.write(data)
+    
+    def flush(self):
+        self.f.flush()
+
 def create_update_package():
     """Create update package with resource pooling system."""
     
@@ -17,52 +37,42 @@ def create_update_package():
     version = "2.0.0"
     update_name = f"alpha-agent-{version}"
     
-    # Create update directory
-    update_dir = Path(f"updates/{update_name}")
-    update_dir.mkdir(parents=True, exist_ok=True)
+    # Project root, relative to server_example/ where this script is run
+    project_root = Path("..")
     
     # Files to include in update (relative to project root)
     files_to_include = [
-        "../main.py",
-        "../updater.py", 
-        "../config.json",
-        "../requirements.txt",
-        "../modules/__init__.py",
-        "../modules/simple_coordinator.py",
-        "../modules/resource_pool.py",  # New resource pooling module
-        "../modules/gpu_share.py",
-        "../modules/network_bridge.py", 
-        "../modules/disk_share.py"
+        "main.py",
+        "updater.py",
+        "config.json",
+        "requirements.txt",
+        "modules/__init__.py",
+        "modules/agent_identity.py",  # Shared by the modules below
+        "modules/gpu_probe.py",  # Shared by resource_pool and ravencoin_miner
+        "modules/simple_coordinator.py",
+        "modules/resource_pool.py",  # New resource pooling module
+        "modules/gpu_share.py",
+        "modules/network_bridge.py",
+        "modules/disk_share.py"
     ]
     
     print(f"Creating update package: {update_name}")
+    Path("updates").mkdir(exist_ok=True)
     
-    # Copy files to update directory
-    for file_path in files_to_include:
-        src_path = Path(file_path)
-        if src_path.exists():
-            dst_path = update_dir / file_path
-            dst_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Copy file
-            with open(src_path, 'rb') as src, open(dst_path, 'wb') as dst:
-                dst.write(src.read())
-            print(f"  + Added: {file_path}")
-        else:
-            print(f"  - Missing: {file_path}")
-    
-    # Create update zip
+    # Zip files straight from the project, with no staging copy, calculating
+    # the checksum as the zip is written
     zip_path = f"updates/{update_name}.zip"
-    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for root, dirs, files in os.walk(update_dir):
-            for file in files:
-                file_path = Path(root) / file
-                arc_path = file_path.relative_to(update_dir)
-                zipf.write(file_path, arc_path)
-    
-    # Calculate checksum
-    with open(zip_path, 'rb') as f:
-        checksum = hashlib.sha256(f.read()).hexdigest()
+    sha256_hash = hashlib.sha256()
+    with open(zip_path, 'wb') as raw, zipfile.ZipFile(HashingWriter(raw, sha256_hash), 'w', zipfile.ZIP_DEFLATED) as zipf:
+        for file_path in files_to_include:
+            src_path = project_root / file_path
+            if src_path.exists():
+                zipf.write(src_path, file_path)
+                print(f"  + Added: {file_path}")
+            else:
+                print(f"  - Missing: {file_path}")
+    
+    checksum = sha256_hash.hexdigest()
     
     # Get file size
     file_size = os.path.getsize(zip_path)
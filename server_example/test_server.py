@@ -3,24 +3,62 @@ Simple HTTP server for testing updates locally.
 Serves the updates.json file and update packages.
 """
 
+import functools
+import hashlib
 import http.server
-import socketserver
 import os
 import sys
 from pathlib import Path
 
 PORT = 8000
 
+
+@functools.lru_cache(maxsize=128)
+def content_etag(path, mtime_ns, size):
+    """ETag for a file's contents; keyed on mtime and size so edits are picked up."""
+    with open(path, 'rb') as f:
+        return '"%s"' % hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+
 class UpdateServerHandler(http.server.SimpleHTTPRequestHandler):
     """Custom handler to serve update files with proper headers."""
     
+    etag = None
+    
+    def send_head(self):
+        # Answer 304 when the agent already has this version of the file;
+        # If-Modified-Since is handled by the base class
+        self.etag = None
+        path = self.translate_path(self.path)
+        if os.path.isfile(path):
+            st = os.stat(path)
+            self.etag = content_etag(path, st.st_mtime_ns, st.st_size)
+            
+            if_none_match = self.headers.get('If-None-Match')
+            if if_none_match and (if_none_match.strip() == '*' or
+                                  self.etag in (tag.strip() for tag in if_none_match.split(','))):
+                self.send_response(304)
+                self.end_headers()
+                return None
+        
+        return super().send_head()
+    
     def end_headers(self):
+        if self.etag:
+            self.send_header('ETag', self.etag)
+        
         # Add CORS headers for testing
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET')
         self.send_header('Access-Control-Allow-Headers', 'Content-Type')
         super().end_headers()
     
+    def copyfile(self, source, outputfile):
+        # Let the kernel copy the file to the socket (sendfile) instead of
+        # reading it through Python in chunks
+        outputfile.flush()
+        self.connection.sendfile(source)
+    
     def log_message(self, format, *args):
         # Custom logging
         print(f"[{self.log_date_time_string()}] {format % args}")
@@ -58,7 +96,8 @@ Press Ctrl+C to stop the server.
     """)
     
     try:
-        with socketserver.TCPServer(("", PORT), UpdateServerHandler) as httpd:
+        # One thread per connection, so agents downloading at once don't queue
+        with http.server.ThreadingHTTPServer(("", PORT), UpdateServerHandler) as httpd:
             print(f"Server started on port {PORT}\n")
             httpd.serve_forever()
     except KeyboardInterrupt:
@@ -3,17 +3,22 @@ Alpha Update Agent - Updater Module
 Handles version checking, downloading, and applying updates.
 """
 
+import errno
 import os
 import sys
 import json
 import hashlib
+import hmac
 import shutil
 import zipfile
 import tempfile
 import logging
+import time
 from pathlib import Path
 from typing import Dict, Optional, Tuple
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
 class UpdaterException(Exception):
@@ -26,6 +31,13 @@ class Updater:
     Manages the update lifecycle: check, download, verify, apply, rollback.
     """
     
+    # Top-level files backed up alongside the modules directory
+    BACKUP_FILES = ('main.py', 'updater.py', 'config.json')
+    
+    # Attempts at a download interrupted mid-transfer; each retry resumes
+    # from the bytes already written when the server supports Range requests
+    DOWNLOAD_ATTEMPTS = 3
+    
     def __init__(self, config_path: str = "config.json"):
         """
         Initialize the updater with configuration.
@@ -44,6 +56,16 @@ class Updater:
         self.modules_dir.mkdir(exist_ok=True)
         self.backup_dir.mkdir(exist_ok=True)
         
+        # Shared by the update check and the download, so the download can
+        # reuse the check's connection (and TLS session)
+        self.session = requests.Session()
+        for prefix in ('http://', 'https://'):
+            self.session.mount(prefix, HTTPAdapter(max_retries=Retry(total=2, backoff_factor=0.2)))
+        
+        # Validators of the last update info that needed no update, sent on
+        # the next check so an unchanged file comes back as an empty 304
+        self.update_validators = {}
+        
     def _load_config(self) -> Dict:
         """Load configuration from JSON file."""
         try:
@@ -55,9 +77,15 @@ class Updater:
             raise UpdaterException(f"Invalid JSON in config file: {e}")
     
     def _save_config(self):
-        """Save current configuration to JSON file."""
-        with open(self.config_path, 'w') as f:
+        """
+        Save current configuration to JSON file. Written to a temporary file
+        and renamed over the old one, so the file is never left half-written
+        and a hard-linked backup of it is never modified.
+        """
+        temp_path = f"{self.config_path}.tmp"
+        with open(temp_path, 'w') as f:
             json.dump(self.config, f, indent=4)
+        os.replace(temp_path, self.config_path)
     
     def _setup_logging(self) -> logging.Logger:
         """Configure logging for the updater."""
@@ -102,28 +130,41 @@ class Updater:
             return None
         
         try:
-            self.logger.info(f"Checking for updates at {update_server}")
-            response = requests.get(update_server, timeout=10)
+            self.logger.info("Checking for updates at %s", update_server)
+            response = self.session.get(update_server, headers=self.update_validators, timeout=10)
+            
+            if response.status_code == 304:
+                self.logger.info("Already up to date (update info unchanged)")
+                return None
+            
             response.raise_for_status()
             
             update_info = response.json()
             remote_version = update_info.get('version', '0.0.0')
             current_version = self.get_current_version()
             
-            self.logger.info(f"Current: {current_version}, Remote: {remote_version}")
+            self.logger.info("Current: %s, Remote: %s", current_version, remote_version)
             
             if self._is_newer_version(remote_version, current_version):
-                self.logger.info(f"Update available: {remote_version}")
+                self.logger.info("Update available: %s", remote_version)
                 return update_info
             else:
                 self.logger.info("Already up to date")
+                
+                # Only remembered when no update is needed, so an update that
+                # failed to apply is fetched and retried on the next check
+                self.update_validators = {}
+                if 'ETag' in response.headers:
+                    self.update_validators['If-None-Match'] = response.headers['ETag']
+                if 'Last-Modified' in response.headers:
+                    self.update_validators['If-Modified-Since'] = response.headers['Last-Modified']
                 return None
                 
         except requests.exceptions.RequestException as e:
-            self.logger.error(f"Failed to check for updates: {e}")
+            self.logger.error("Failed to check for updates: %s", e)
             return None
         except json.JSONDecodeError as e:
-            self.logger.error(f"Invalid update info JSON: {e}")
+            self.logger.error("Invalid update info JSON: %s", e)
             return None
     
     def _is_newer_version(self, remote: str, current: str) -> bool:
@@ -151,15 +192,16 @@ class Updater:
             self.logger.warning("Invalid version format, assuming no update")
             return False
     
-    def download_update(self, update_info: Dict) -> Optional[Path]:
+    def download_update(self, update_info: Dict) -> Optional[Tuple[Path, str]]:
         """
-        Download update package from remote server.
+        Download update package from remote server, hashing it as it is
+        written so verification doesn't have to read it back.
         
         Args:
             update_info: Update information dictionary
             
         Returns:
-            Path to downloaded file or None on failure
+            Tuple of (path to downloaded file, SHA256 hex digest) or None on failure
         """
         url = update_info.get('url')
         if not url:
@@ -167,40 +209,100 @@ class Updater:
             return None
         
         try:
-            self.logger.info(f"Downloading update from {url}")
-            response = requests.get(url, timeout=30, stream=True)
-            response.raise_for_status()
+            self.logger.info("Downloading update from %s", url)
             
             # Download to temporary file
             temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.zip')
             temp_path = Path(temp_file.name)
             
-            total_size = int(response.headers.get('content-length', 0))
+            total_size = 0
             downloaded = 0
+            next_progress = 0  # Percentage at which progress is next logged
+            sha256_hash = hashlib.sha256()
+            headers = {}
+            
+            # 1 MiB chunks keep per-chunk Python overhead (write, hash, progress)
+            # negligible; written through the temp file's own handle
+            with temp_file as f:
+                for attempt in range(self.DOWNLOAD_ATTEMPTS):
+                    try:
+                        response = self.session.get(url, timeout=30, stream=True, headers=headers)
+                        response.raise_for_status()
+                        
+                        # Append only if the partial content starts where the file ends
+                        resumed = response.status_code == 206 and self._content_range_start(response) == downloaded
+                        if response.status_code == 206 and not resumed:
+                            self.logger.info("Server resumed at the wrong offset, restarting the download")
+                            response.close()
+                            response = self.session.get(url, timeout=30, stream=True)
+                            response.raise_for_status()
+                            if response.status_code == 206:
+                                raise requests.exceptions.RequestException("Unexpected partial response")
+                        
+                        if not resumed:
+                            # A full response: first attempt, or the server ignored
+                            # the Range (or the file changed), so start over
+                            if downloaded:
+                                self.logger.info("Server did not resume the download, restarting")
+                                f.seek(0)
+                                f.truncate()
+                                downloaded = 0
+                                next_progress = 0
+                                sha256_hash = hashlib.sha256()
+                            total_size = int(response.headers.get('content-length', 0))
+                        
+                        for chunk in response.iter_content(chunk_size=1024 * 1024):
+                            if chunk:
+                                f.write(chunk)
+                                sha256_hash.update(chunk)
+                                downloaded += len(chunk)
+                                if total_size > 0:
+                                    progress = (downloaded / total_size) * 100
+                                    if progress >= next_progress:
+                                        self.logger.debug("Download progress: %.1f%%", progress)
+                                        next_progress = progress + 5
+                        break
+                        
+                    except (requests.exceptions.ChunkedEncodingError,
+                            requests.exceptions.ConnectionError) as e:
+                        if attempt + 1 == self.DOWNLOAD_ATTEMPTS:
+                            raise
+                        
+                        self.logger.warning("Download interrupted at %d bytes, retrying: %s", downloaded, e)
+                        time.sleep(2 ** attempt)
+                        
+                        # Ask for the rest only; If-Range makes the server send the
+                        # whole file instead if it changed since the first attempt
+                        headers = {'Range': f'bytes={downloaded}-'} if downloaded else {}
+                        # (servers must ignore a weak ETag there, so it isn't sent)
+                        etag = response.headers.get('ETag') if downloaded else None
+                        if etag and not etag.startswith('W/'):
+                            headers['If-Range'] = etag
             
-            with open(temp_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        if total_size > 0:
-                            progress = (downloaded / total_size) * 100
-                            self.logger.debug(f"Download progress: {progress:.1f}%")
-            
-            self.logger.info(f"Download complete: {temp_path}")
-            return temp_path
+            self.logger.info("Download complete: %s", temp_path)
+            return temp_path, sha256_hash.hexdigest()
             
         except requests.exceptions.RequestException as e:
-            self.logger.error(f"Download failed: {e}")
+            self.logger.error("Download failed: %s", e)
             return None
     
-    def verify_update(self, file_path: Path, update_info: Dict) -> bool:
+    @staticmethod
+    def _content_range_start(response) -> Optional[int]:
+        """First byte offset of a 206 response's Content-Range, or None if missing or malformed."""
+        unit, _, byte_range = response.headers.get('Content-Range', '').partition(' ')
+        start = byte_range.split('-', 1)[0]
+        return int(start) if unit == 'bytes' and start.isdigit() else None
+    
+    def verify_update(self, file_path: Path, update_info: Dict,
+                      actual_checksum: Optional[str] = None) -> bool:
         """
         Verify integrity of downloaded update using checksum.
         
         Args:
             file_path: Path to downloaded file
             update_info: Update information with checksum
+            actual_checksum: SHA256 of the file if already known (e.g. hashed
+                during download); otherwise the file is read and hashed
             
         Returns:
             True if verification successful
@@ -213,26 +315,29 @@ class Updater:
         try:
             self.logger.info("Verifying update integrity...")
             
-            # Calculate SHA256 checksum
-            sha256_hash = hashlib.sha256()
-            with open(file_path, 'rb') as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    sha256_hash.update(chunk)
-            
-            actual_checksum = sha256_hash.hexdigest()
+            # Calculate SHA256 checksum; Python 3.11+ hashes the file in C
+            if actual_checksum is None:
+                with open(file_path, 'rb') as f:
+                    if hasattr(hashlib, 'file_digest'):
+                        actual_checksum = hashlib.file_digest(f, 'sha256').hexdigest()
+                    else:
+                        sha256_hash = hashlib.sha256()
+                        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                            sha256_hash.update(chunk)
+                        actual_checksum = sha256_hash.hexdigest()
             
-            if actual_checksum.lower() == expected_checksum.lower():
+            if hmac.compare_digest(actual_checksum, expected_checksum.lower()):
                 self.logger.info("Checksum verification passed")
                 return True
             else:
                 self.logger.error(
-                    f"Checksum mismatch! Expected: {expected_checksum}, "
-                    f"Got: {actual_checksum}"
+                    "Checksum mismatch! Expected: %s, Got: %s",
+                    expected_checksum, actual_checksum
                 )
                 return False
                 
         except Exception as e:
-            self.logger.error(f"Verification failed: {e}")
+            self.logger.error("Verification failed: %s", e)
             return False
     
     def create_backup(self) -> Path:
@@ -243,24 +348,27 @@ class Updater:
             Path to backup directory
         """
         current_version = self.get_current_version()
-        backup_name = f"backup_{current_version}_{int(Path.ctime(Path(__file__)))}"
+        # Unique per attempt: after a rollback, the version and files are
+        # unchanged, and the next attempt must not land in the same directory
+        backup_name = f"backup_{current_version}_{time.time_ns()}"
         backup_path = self.backup_dir / backup_name
         
         try:
-            self.logger.info(f"Creating backup: {backup_path}")
+            self.logger.info("Creating backup: %s", backup_path)
             backup_path.mkdir(exist_ok=True)
             
             # Backup main files
-            for file in ['main.py', 'updater.py', 'config.json']:
+            for file in self.BACKUP_FILES:
                 src = self.base_dir / file
-                if src.exists():
-                    shutil.copy2(src, backup_path / file)
+                if src.is_file():
+                    self._snapshot_file(src, backup_path / file)
             
             # Backup modules directory
             if self.modules_dir.exists():
                 shutil.copytree(
                     self.modules_dir,
                     backup_path / 'modules',
+                    copy_function=self._snapshot_file,
                     dirs_exist_ok=True
                 )
             
@@ -270,27 +378,50 @@ class Updater:
             return backup_path
             
         except Exception as e:
-            self.logger.error(f"Backup creation failed: {e}")
+            self.logger.error("Backup creation failed: %s", e)
             raise UpdaterException(f"Failed to create backup: {e}")
     
+    @staticmethod
+    def _snapshot_file(src, dst):
+        """
+        Back up a file as a hard link, copying only if linking fails (e.g.
+        another filesystem). Safe because updates never rewrite files in
+        place: apply_update() and _save_config() swap in new files with
+        os.replace(), leaving the backup's link pointing at the old contents.
+        """
+        if os.path.lexists(dst):
+            if os.path.exists(dst) and os.path.samefile(src, dst):
+                return  # Already linked, e.g. by an interrupted earlier attempt
+            os.unlink(dst)
+        
+        try:
+            os.link(src, dst)
+        except OSError as e:
+            # Copy only where linking can't work; anything else is a real error
+            if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.EOPNOTSUPP):
+                raise
+            shutil.copy2(src, dst)
+    
     def _cleanup_old_backups(self):
         """Remove old backups, keeping only the most recent ones."""
         backup_count = self.config.get('backup_count', 3)
         
         try:
-            backups = sorted(
-                [d for d in self.backup_dir.iterdir() if d.is_dir()],
-                key=lambda x: x.stat().st_mtime,
-                reverse=True
-            )
+            # scandir's entries know their type without an extra stat() each
+            with os.scandir(self.backup_dir) as entries:
+                backups = sorted(
+                    [entry for entry in entries if entry.is_dir(follow_symlinks=False)],
+                    key=lambda entry: entry.stat().st_mtime,
+                    reverse=True
+                )
             
             # Remove old backups
             for old_backup in backups[backup_count:]:
-                self.logger.info(f"Removing old backup: {old_backup}")
-                shutil.rmtree(old_backup)
+                self.logger.info("Removing old backup: %s", old_backup.path)
+                shutil.rmtree(old_backup.path)
                 
         except Exception as e:
-            self.logger.warning(f"Failed to cleanup old backups: {e}")
+            self.logger.warning("Failed to cleanup old backups: %s", e)
     
     def apply_update(self, update_file: Path, update_info: Dict) -> bool:
         """
@@ -306,26 +437,32 @@ class Updater:
         try:
             self.logger.info("Applying update...")
             
-            # Extract update to temporary directory
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir)
-                
+            # Extract update to a staging directory inside the installation,
+            # so files can be moved into place by rename instead of copied
+            with tempfile.TemporaryDirectory(dir=self.base_dir, prefix='.staging-') as temp_dir:
                 # Extract zip file
                 with zipfile.ZipFile(update_file, 'r') as zip_ref:
-                    zip_ref.extractall(temp_path)
+                    zip_ref.extractall(temp_dir)
                 
-                # Copy files to installation directory
-                for item in temp_path.rglob('*'):
-                    if item.is_file():
-                        rel_path = item.relative_to(temp_path)
-                        dest_path = self.base_dir / rel_path
-                        
-                        # Create parent directories if needed
-                        dest_path.parent.mkdir(parents=True, exist_ok=True)
-                        
-                        # Copy file
-                        shutil.copy2(item, dest_path)
-                        self.logger.debug(f"Updated: {rel_path}")
+                # Move files into the installation directory, a directory at a
+                # time so each destination directory is created once; plain
+                # string paths keep the per-file work to the rename itself
+                base = os.fspath(self.base_dir)
+                for dirpath, _, filenames in os.walk(temp_dir):
+                    if not filenames:
+                        continue
+                    
+                    rel_dir = os.path.relpath(dirpath, temp_dir)
+                    dest_dir = os.path.normpath(os.path.join(base, rel_dir))
+                    
+                    # Create parent directories if needed
+                    os.makedirs(dest_dir, exist_ok=True)
+                    
+                    for name in filenames:
+                        # Same filesystem, so this is a rename: no data is copied,
+                        # and the old file is swapped for the new one atomically
+                        os.replace(os.path.join(dirpath, name), os.path.join(dest_dir, name))
+                        self.logger.debug("Updated: %s", os.path.normpath(os.path.join(rel_dir, name)))
             
             # Update version in config
             self.config['version'] = update_info['version']
@@ -336,11 +473,11 @@ class Updater:
             
             self._save_config()
             
-            self.logger.info(f"Update to version {update_info['version']} completed successfully")
+            self.logger.info("Update to version %s completed successfully", update_info['version'])
             return True
             
         except Exception as e:
-            self.logger.error(f"Failed to apply update: {e}")
+            self.logger.error("Failed to apply update: %s", e)
             return False
     
     def rollback(self, backup_path: Path) -> bool:
@@ -354,17 +491,32 @@ class Updater:
             True if rollback successful
         """
         try:
-            self.logger.warning(f"Rolling back to backup: {backup_path}")
+            self.logger.warning("Rolling back to backup: %s", backup_path)
             
-            # Restore files from backup
-            for item in backup_path.rglob('*'):
-                if item.is_file():
-                    rel_path = item.relative_to(backup_path)
-                    dest_path = self.base_dir / rel_path
+            # Restore files from backup, a directory at a time like apply_update()
+            base = os.fspath(self.base_dir)
+            for dirpath, _, filenames in os.walk(backup_path):
+                if not filenames:
+                    continue
+                
+                rel_dir = os.path.relpath(dirpath, backup_path)
+                dest_dir = os.path.normpath(os.path.join(base, rel_dir))
+                os.makedirs(dest_dir, exist_ok=True)
+                
+                for name in filenames:
+                    src = os.path.join(dirpath, name)
+                    dest = os.path.join(dest_dir, name)
+                    
+                    # Files the update didn't replace are still hard links to the backup
+                    if os.path.exists(dest) and os.path.samefile(src, dest):
+                        continue
                     
-                    dest_path.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.copy2(item, dest_path)
-                    self.logger.debug(f"Restored: {rel_path}")
+                    # Link (or copy) beside the target and swap it in, rather than
+                    # writing into a file another backup may share
+                    temp_path = f"{dest}.restore"
+                    self._snapshot_file(src, temp_path)
+                    os.replace(temp_path, dest)
+                    self.logger.debug("Restored: %s", os.path.normpath(os.path.join(rel_dir, name)))
             
             # Reload config
             self.config = self._load_config()
@@ -373,7 +525,7 @@ class Updater:
             return True
             
         except Exception as e:
-            self.logger.error(f"Rollback failed: {e}")
+            self.logger.error("Rollback failed: %s", e)
             return False
     
     def perform_update(self) -> Tuple[bool, str]:
@@ -390,13 +542,14 @@ class Updater:
                 return True, "No updates available"
             
             # Download update
-            update_file = self.download_update(update_info)
-            if not update_file:
+            download = self.download_update(update_info)
+            if not download:
                 return False, "Download failed"
+            update_file, checksum = download
             
             try:
-                # Verify integrity
-                if not self.verify_update(update_file, update_info):
+                # Verify integrity, using the checksum computed while downloading
+                if not self.verify_update(update_file, update_info, checksum):
                     return False, "Integrity verification failed"
                 
                 # Create backup
@@ -419,6 +572,6 @@ class Updater:
                     update_file.unlink()
                     
         except Exception as e:
-            self.logger.error(f"Update process failed: {e}")
+            self.logger.error("Update process failed: %s", e)
             return False, str(e)
 